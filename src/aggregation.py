@@ -2,6 +2,7 @@ import math
 import re
 import statistics
 from collections import Counter
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 LOCATION_PREFIXES = (
@@ -29,6 +30,8 @@ DEFAULT_NUMERIC_TOLERANCES = {
 }
 
 
+# The normalisers below see a small, repeating vocabulary (place names, precip types), so results are memoised
+@lru_cache(maxsize=4096)
 def normalize_location_string(value: Optional[str]) -> str:
     if value is None:
         return ""
@@ -46,6 +49,7 @@ def normalize_location_string(value: Optional[str]) -> str:
     return stripped
 
 
+@lru_cache(maxsize=256)
 def normalize_precip_type(value: Optional[str]) -> str:
     if value is None:
         return ""
@@ -55,6 +59,7 @@ def normalize_precip_type(value: Optional[str]) -> str:
     return PRECIP_TYPE_ALIASES.get(stripped, PRECIP_TYPE_ALIASES.get(stripped.lower(), stripped))
 
 
+@lru_cache(maxsize=4096)
 def normalize_text_value(section: str, measurement_type: str, value: Optional[str]) -> str:
     raw = (value or "").strip()
     if section == "Precip" and measurement_type == "Type":
@@ -92,6 +97,26 @@ def harmonize_locations(final_rows: Dict[Tuple[Any, ...], Dict[str, Any]]) -> No
             row["Location"] = ""
 
 
+def _disagreement(sample: Dict[str, Any], issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "key": {
+            "SourceFile": sample.get("SourceFile"),
+            "Page": sample.get("Page"),
+            "Section": sample.get("Section"),
+            "Measurement": sample.get("Measurement"),
+            "MeasurementType": sample.get("MeasurementType"),
+            "HourIndex": sample.get("HourIndex"),
+            "HourLabel": sample.get("HourLabel"),
+        },
+        "graph": {
+            "SourceFile": sample.get("SourceFile"),
+            "Page": sample.get("Page"),
+            "Section": sample.get("Section"),
+        },
+        "issues": issues,
+    }
+
+
 def aggregate_runs(
     run_maps: List[Dict[Tuple[Any, ...], Dict[str, Any]]],
     tolerances: Dict[Tuple[str, str], float],
@@ -115,7 +140,6 @@ def aggregate_runs(
         section = sample.get("Section")
         measurement = sample.get("Measurement")
         measurement_type = sample.get("MeasurementType")
-        graph_key = (sample.get("SourceFile"), sample.get("Page"), section)
         issues: List[Dict[str, Any]] = []
 
         missing_runs = [idx for idx, row in enumerate(rows) if row is None]
@@ -191,25 +215,7 @@ def aggregate_runs(
         final_rows[key] = merged_row
 
         if issues:
-            disagreements.append(
-                {
-                    "key": {
-                        "SourceFile": sample.get("SourceFile"),
-                        "Page": sample.get("Page"),
-                        "Section": section,
-                        "Measurement": measurement,
-                        "MeasurementType": measurement_type,
-                        "HourIndex": sample.get("HourIndex"),
-                        "HourLabel": sample.get("HourLabel"),
-                    },
-                    "graph": {
-                        "SourceFile": graph_key[0],
-                        "Page": graph_key[1],
-                        "Section": graph_key[2],
-                    },
-                    "issues": issues,
-                }
-            )
+            disagreements.append(_disagreement(sample, issues))
 
     harmonize_locations(final_rows)
     return final_rows, disagreements
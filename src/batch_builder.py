@@ -1,15 +1,23 @@
-import json
 import os
 import uuid
+from functools import lru_cache
 from typing import Dict, List
 
+from PIL import ImageChops
 from pydantic import BaseModel
 
+from .jsonio import dumps
 from .models import RegionDetection, CombinedSeries, WindSeries, PrecipSeries, TempSeries
 from .utils import pil_to_data_url, ensure_rgb, resize_max_side
 
 
+@lru_cache(maxsize=None)
 def _json_schema_response_format(name: str, model: type[BaseModel]) -> Dict:
+    """Strict json_schema response format for model, built once per (name, model).
+
+    The same dict is shared by every request body of that kind, so treat it as read-only.
+    """
+
     def _strictify(s: Dict) -> Dict:
         t = s.get("type")
         if t == "object":
@@ -98,6 +106,24 @@ def build_detect_regions_request(model_name: str, page_img, prompt: str | None =
     }
 
 
+# Largest per-pixel channel spread still treated as grey (absorbs anti-aliasing noise)
+GRAY_TOLERANCE = 4
+
+
+def _is_grayscale(im) -> bool:
+    r, g, b = im.split()
+    spread = max(ImageChops.difference(r, g).getextrema()[1], ImageChops.difference(g, b).getextrema()[1])
+    return spread <= GRAY_TOLERANCE
+
+
+def _crop_data_url(crop_img, max_side: int) -> str:
+    im = resize_max_side(ensure_rgb(crop_img), max_side)
+    # Series are told apart by colour, so only crops with no colour at all drop to a single-channel JPEG
+    if _is_grayscale(im):
+        im = im.convert("L")
+    return pil_to_data_url(im, format="JPEG", quality=80)
+
+
 def build_extract_all_request(model_name: str, crops_by_kind: Dict[str, any], prompt: str | None = None, max_side: int = 900) -> Dict:
     prompt = prompt or (
         "Three images follow in order: (1) wind graph, (2) precipitation graph, (3) temperature graph. "
@@ -106,9 +132,7 @@ def build_extract_all_request(model_name: str, crops_by_kind: Dict[str, any], pr
     order = ["wind", "precipitation", "temperature"]
     content = [{"type": "input_text", "text": prompt}]
     for k in order:
-        im = ensure_rgb(crops_by_kind[k])
-        im = resize_max_side(im, max_side)
-        content.append({"type": "input_image", "image_url": pil_to_data_url(im, format="JPEG", quality=80)})
+        content.append({"type": "input_image", "image_url": _crop_data_url(crops_by_kind[k], max_side)})
 
     content[0]["text"] += (
         "\nUse the same location string copied exactly from the shared graph title (empty string if unreadable). "
@@ -146,11 +170,9 @@ def build_extract_wind_request(model_name: str, crop_img, prompt: str | None = N
         "If values are unclear, estimate from neighbouring points and the gridlines. "
         "Include 'location' exactly as the graph title text (empty string only if unreadable); do not use page footers or add qualifiers."
     )
-    im = ensure_rgb(crop_img)
-    im = resize_max_side(im, max_side)
     content = [
         {"type": "input_text", "text": prompt},
-        {"type": "input_image", "image_url": pil_to_data_url(im, format="JPEG", quality=80)},
+        {"type": "input_image", "image_url": _crop_data_url(crop_img, max_side)},
     ]
     content[0]["text"] += "\nReturn JSON only with keys: location, hours (24 items) and honour the schema's field names."
     body = {
@@ -180,11 +202,9 @@ def build_extract_precip_request(model_name: str, crop_img, prompt: str | None =
         "Double-check the 18:00 bar against the axis labels to confirm the scale before extracting the rest of the series. "
         "Include 'location' exactly as the graph title text (empty string only if unreadable); avoid page footers and qualifiers."
     )
-    im = ensure_rgb(crop_img)
-    im = resize_max_side(im, max_side)
     content = [
         {"type": "input_text", "text": prompt},
-        {"type": "input_image", "image_url": pil_to_data_url(im, format="JPEG", quality=80)},
+        {"type": "input_image", "image_url": _crop_data_url(crop_img, max_side)},
     ]
     content[0]["text"] += "\nReturn JSON only with keys: location, hours (24 items) and honour the schema's field names."
     body = {
@@ -212,11 +232,9 @@ def build_extract_temperature_request(model_name: str, crop_img, prompt: str | N
         "If a point is unclear, estimate from the surrounding curve and gridlines instead of dropping the hour. "
         "Include 'location' exactly as the graph title text (empty string only if unreadable); do not use page footers or add qualifiers."
     )
-    im = ensure_rgb(crop_img)
-    im = resize_max_side(im, max_side)
     content = [
         {"type": "input_text", "text": prompt},
-        {"type": "input_image", "image_url": pil_to_data_url(im, format="JPEG", quality=80)},
+        {"type": "input_image", "image_url": _crop_data_url(crop_img, max_side)},
     ]
     content[0]["text"] += "\nReturn JSON only with keys: location, hours (24 items) and honour the schema's field names."
     body = {
@@ -238,6 +256,7 @@ def write_jsonl(items: List[Dict], path: str) -> None:
     dir_path = os.path.dirname(path)
     if dir_path:
         os.makedirs(dir_path, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        for item in items:
-            f.write(json.dumps(item, separators=(",", ":")) + "\n")
+    # Serialize everything into one buffer and hand it to the OS in a single write
+    buf = b"\n".join(map(dumps, items))
+    with open(path, "wb") as f:
+        f.write(buf + b"\n" if buf else buf)
@@ -1,7 +1,9 @@
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Set, Tuple
 
 from PIL import Image
 
@@ -9,14 +11,55 @@ from .batch_builder import (
     build_extract_precip_request,
     build_extract_temperature_request,
     build_extract_wind_request,
-    write_jsonl,
 )
+from .jsonio import dumps
 from .local_detect import detect_graphs_on_page_local
-from .pdf_render import render_pdf_to_images
-from .run_batch_pipeline import discover_pdfs
+from .pdf_render import pdf_page_count, render_pdf_to_images
+from .run_batch_pipeline import build_tagged_request, discover_pdfs
 from .utils import crop_normalized_box
 
 
+def _pdf_requests(pdf: Path, args: argparse.Namespace, kinds_set: Set[str]) -> List[Tuple[Any, str]]:
+    """(request builder, custom_id) for every crop of one PDF."""
+    pending: List[Tuple[Any, str]] = []
+    # Cover and back pages never hold graphs, so only the pages between them are rendered
+    pages = render_pdf_to_images(
+        str(pdf), dpi=args.dpi, workers=args.render_workers, pages=range(2, pdf_page_count(str(pdf)))
+    )
+    for i, img in enumerate(pages, start=2):
+        regions = detect_graphs_on_page_local(img)
+        if regions.get("page_type") != "area_graphs":
+            continue
+        graphs = regions.get("graphs", [])
+        by_kind: Dict[str, Image.Image] = {}
+        for g in graphs:
+            k = g.get("kind")
+            if k not in kinds_set:
+                continue
+            crop = crop_normalized_box(img, g.get("bbox"), args.max_crop_px)
+            by_kind[k] = crop
+
+        if args.mode == "combined":
+            # Only create a combined request when we have all three crops
+            if all(k in by_kind for k in ("wind", "precipitation", "temperature")):
+                from .batch_builder import build_extract_all_request
+                build = partial(build_extract_all_request, args.model, by_kind, max_side=args.max_crop_px)
+                pending.append((build, f"extract::{pdf.name}::p{i}::combined"))
+            continue
+
+        # Per-graph mode
+        if "wind" in by_kind:
+            build = partial(build_extract_wind_request, args.model, by_kind["wind"], max_side=args.max_crop_px)
+            pending.append((build, f"extract::{pdf.name}::p{i}::wind"))
+        if "precipitation" in by_kind:
+            build = partial(build_extract_precip_request, args.model, by_kind["precipitation"], max_side=args.max_crop_px)
+            pending.append((build, f"extract::{pdf.name}::p{i}::precipitation"))
+        if "temperature" in by_kind:
+            build = partial(build_extract_temperature_request, args.model, by_kind["temperature"], max_side=args.max_crop_px)
+            pending.append((build, f"extract::{pdf.name}::p{i}::temperature"))
+    return pending
+
+
 def main():
     parser = argparse.ArgumentParser(description="Build OpenAI Batch JSONL for per-graph extraction using local detection")
     parser.add_argument("--input", nargs="*", help="Input PDF files (defaults to --input-dir)")
@@ -28,56 +71,24 @@ def main():
     parser.add_argument("--max_crop_px", type=int, default=720)
     parser.add_argument("--kinds", type=str, default="wind,precipitation,temperature")
     parser.add_argument("--mode", choices=["per-graph", "combined"], default="per-graph", help="Extract per graph or as a single combined request per page")
+    parser.add_argument("--render_workers", type=int, default=1, help="Processes used to render each PDF (default: 1, render in-process)")
     args = parser.parse_args()
 
     pdfs = discover_pdfs(args.input, Path(args.input_dir).resolve())
-    items = []
     kinds_set = {k.strip() for k in args.kinds.split(",") if k.strip()}
+    out_jsonl = Path(args.out_jsonl)
+    out_jsonl.parent.mkdir(parents=True, exist_ok=True)
+    n_items = 0
 
-    for pdf in pdfs:
-        pages = render_pdf_to_images(str(pdf), dpi=args.dpi)
-        total = len(pages)
-        for i, img in enumerate(pages, start=1):
-            if i in (1, total):
-                continue
-            regions = detect_graphs_on_page_local(img)
-            if regions.get("page_type") != "area_graphs":
-                continue
-            graphs = regions.get("graphs", [])
-            by_kind: Dict[str, Image.Image] = {}
-            for g in graphs:
-                k = g.get("kind")
-                if k not in kinds_set:
-                    continue
-                crop = crop_normalized_box(img, tuple(g.get("bbox")))
-                by_kind[k] = crop
-
-            if args.mode == "combined":
-                # Only create a combined request when we have all three crops
-                if all(k in by_kind for k in ("wind", "precipitation", "temperature")):
-                    from .batch_builder import build_extract_all_request
-                    req = build_extract_all_request(args.model, by_kind, max_side=args.max_crop_px)
-                    req["custom_id"] = f"extract::{pdf.name}::p{i}::combined"
-                    items.append(req)
-                continue
-
-            # Per-graph mode
-            if "wind" in by_kind:
-                req = build_extract_wind_request(args.model, by_kind["wind"], max_side=args.max_crop_px)
-                req["custom_id"] = f"extract::{pdf.name}::p{i}::wind"
-                items.append(req)
-            if "precipitation" in by_kind:
-                req = build_extract_precip_request(args.model, by_kind["precipitation"], max_side=args.max_crop_px)
-                req["custom_id"] = f"extract::{pdf.name}::p{i}::precipitation"
-                items.append(req)
-            if "temperature" in by_kind:
-                req = build_extract_temperature_request(args.model, by_kind["temperature"], max_side=args.max_crop_px)
-                req["custom_id"] = f"extract::{pdf.name}::p{i}::temperature"
-                items.append(req)
+    # PIL releases the GIL while resizing and encoding, so crops are encoded on every core
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool, open(out_jsonl, "wb") as out:
+        for pdf in pdfs:
+            # Each PDF's crops are encoded and written before the next PDF is rendered, so pages never pile up
+            for item in pool.map(build_tagged_request, _pdf_requests(pdf, args, kinds_set)):
+                out.write(dumps(item) + b"\n")
+                n_items += 1
 
-    out_jsonl = Path(args.out_jsonl)
-    write_jsonl(items, str(out_jsonl))
-    print(f"Wrote {len(items)} batch items to {out_jsonl}")
+    print(f"Wrote {n_items} batch items to {out_jsonl}")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,12 @@
+import math
 import os
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 from PIL import Image
 
 from .llm_client import LLMClient
-from .utils import pil_to_data_url, crop_normalized_box, ensure_rgb, resize_max_side
+from .utils import bytes_to_data_url, encode_image, pil_to_data_url, crop_normalized_box, ensure_rgb, resize_max_side
 from .metrics import time_block, log_event
 from .validate import validate_wind, validate_precip, validate_temperature
 
@@ -30,13 +31,34 @@ def detect_graphs_on_page(img: Image.Image, client: LLMClient, desired_kinds=Non
     return out
 
 
-def extract_graph_series(
-    kind: str, crop: Image.Image, client: LLMClient, metrics_path: Optional[str] = None, page_num: Optional[int] = None, source_file: Optional[str] = None, max_crop_px: Optional[int] = None
-) -> Tuple[Dict, Dict]:
+def prepare_crop(crop: Image.Image, max_crop_px: Optional[int] = None) -> Image.Image:
     crop_img = ensure_rgb(crop)
     if max_crop_px:
         crop_img = resize_max_side(crop_img, max_crop_px)
-    crop_url = pil_to_data_url(crop_img, format="JPEG", quality=80)
+    return crop_img
+
+
+def encode_crop(crop: Image.Image) -> bytes:
+    """JPEG bytes sent to the model for an already prepared crop."""
+    return encode_image(crop, format="JPEG", quality=80)
+
+
+def prepare_crop_url(crop: Image.Image, max_crop_px: Optional[int] = None) -> str:
+    return bytes_to_data_url(encode_crop(prepare_crop(crop, max_crop_px)), format="JPEG")
+
+
+def extract_graph_series(
+    kind: str,
+    crop: Image.Image,
+    client: LLMClient,
+    metrics_path: Optional[str] = None,
+    page_num: Optional[int] = None,
+    source_file: Optional[str] = None,
+    max_crop_px: Optional[int] = None,
+    crop_url: Optional[str] = None,
+) -> Tuple[Dict, Dict]:
+    if crop_url is None:
+        crop_url = prepare_crop_url(crop, max_crop_px)
     # First pass
     if kind == "wind":
         with time_block("extract_wind", metrics_path, page=page_num, file=source_file):
@@ -65,6 +87,47 @@ def extract_graph_series(
     raise ValueError(f"Unknown graph kind: {kind}")
 
 
+VALIDATORS = {
+    "wind": validate_wind,
+    "precipitation": validate_precip,
+    "temperature": validate_temperature,
+}
+
+# Rough per-request budget: image tokens (512px tiles after the API's own downscaling) plus the 24-hour output
+_IMAGE_BASE_TOKENS = 85
+_IMAGE_TILE_TOKENS = 170
+_OUTPUT_TOKENS_PER_GRAPH = 6_000
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    scale = min(1.0, 2048 / max(width, height))
+    w, h = width * scale, height * scale
+    scale = min(1.0, 768 / min(w, h))
+    w, h = w * scale, h * scale
+    tiles = math.ceil(w / 512) * math.ceil(h / 512)
+    return _IMAGE_BASE_TOKENS + _IMAGE_TILE_TOKENS * tiles
+
+
+def batch_graphs(
+    crops_by_kind: Dict[str, Image.Image], context_limit: int = 100_000, max_crop_px: Optional[int] = None
+) -> List[List[str]]:
+    """Greedily pack crops into as few multi-image requests as fit under context_limit tokens."""
+    batches: List[List[str]] = []
+    used = 0
+    for kind, im in crops_by_kind.items():
+        w, h = im.size
+        if max_crop_px and max(w, h) > max_crop_px:
+            ratio = max_crop_px / float(max(w, h))
+            w, h = int(w * ratio), int(h * ratio)
+        cost = estimate_image_tokens(w, h) + _OUTPUT_TOKENS_PER_GRAPH
+        if not batches or used + cost > context_limit:
+            batches.append([])
+            used = 0
+        batches[-1].append(kind)
+        used += cost
+    return batches
+
+
 def extract_all_series(
     crops_by_kind: Dict[str, Image.Image],
     client: LLMClient,
@@ -72,33 +135,23 @@ def extract_all_series(
     page_num: Optional[int] = None,
     source_file: Optional[str] = None,
     max_crop_px: Optional[int] = None,
+    crop_urls: Optional[Dict[str, str]] = None,
 ) -> Tuple[Dict[str, Dict], Dict]:
-    # Ensure we have all three kinds
-    required = ["wind", "precipitation", "temperature"]
-    if any(k not in crops_by_kind for k in required):
-        raise ValueError("extract_all_series requires wind, precipitation, temperature crops")
-
-    crop_urls: Dict[str, str] = {}
-    for k, im in crops_by_kind.items():
-        im_proc = ensure_rgb(im)
-        if max_crop_px:
-            im_proc = resize_max_side(im_proc, max_crop_px)
-        crop_urls[k] = pil_to_data_url(im_proc, format="JPEG", quality=80)
+    if not crops_by_kind or any(k not in VALIDATORS for k in crops_by_kind):
+        raise ValueError("extract_all_series accepts only wind, precipitation, temperature crops")
+
+    if crop_urls is None:
+        crop_urls = {k: prepare_crop_url(im, max_crop_px) for k, im in crops_by_kind.items()}
 
     with time_block("extract_all", metrics_path, page=page_num, file=source_file):
         payload = client.extract_all(crop_urls)
 
     # Validate and optionally retry once with combined feedback
     fb_parts = []
-    ok_w, fb_w = validate_wind(payload.get("wind", {}))
-    if not ok_w:
-        fb_parts.append(f"wind: {fb_w}")
-    ok_p, fb_p = validate_precip(payload.get("precipitation", {}))
-    if not ok_p:
-        fb_parts.append(f"precipitation: {fb_p}")
-    ok_t, fb_t = validate_temperature(payload.get("temperature", {}))
-    if not ok_t:
-        fb_parts.append(f"temperature: {fb_t}")
+    for k in crops_by_kind:
+        ok, fb = VALIDATORS[k](payload.get(k, {}))
+        if not ok:
+            fb_parts.append(f"{k}: {fb}")
 
     retried = False
     if fb_parts:
@@ -110,191 +163,111 @@ def extract_all_series(
     return payload, {"retry": retried}
 
 
-def series_to_rows(
+ROW_COLUMNS = [
+    "SourceFile",
+    "Page",
+    "Location",
+    "Section",
+    "Measurement",
+    "MeasurementType",
+    "Units",
+    "ForecastWindowStartLocal",
+    "HourLabel",
+    "HourIndex",
+    "TimestampLocal",
+    "ValueNumeric",
+    "ValueText",
+    "Notes",
+]
+
+# Per kind, the rows emitted for each hour: (Section, Measurement, MeasurementType, Units, payload key, is_text)
+SERIES_ROW_SPECS = {
+    "wind": [
+        ("Wind", "Wind", "Speed", "mph", "wind_speed_mph", False),
+        ("Wind", "Wind", "Gust", "mph", "wind_gust_mph", False),
+        ("Wind", "Wind", "Direction", "", "wind_direction", True),
+    ],
+    "precipitation": [
+        ("Precip", "Precipitation", "Rain", "mm", "rain_mm", False),
+        ("Precip", "Precipitation", "Snow", "cm", "snow_cm", False),
+        ("Precip", "Precipitation", "Type", "", "precip_type", True),
+    ],
+    "temperature": [
+        ("Temperature", "Temperature", "AirTemp_C", "degC", "air_temp_c", False),
+        ("Temperature", "FreezingLevel", "FreezingLevel_m", "m", "freezing_level_m", False),
+        ("Temperature", "WetBulbFreezingLevel", "WBFL_m", "m", "wet_bulb_freezing_level_m", False),
+    ],
+}
+
+
+def new_columns() -> Dict[str, List]:
+    return {c: [] for c in ROW_COLUMNS}
+
+
+def series_to_columns(
+    columns: Dict[str, List],
     source_file: str,
     page_index: int,
     location: str,
     kind: str,
     payload: Dict,
-) -> List[Dict]:
-    rows: List[Dict] = []
+) -> int:
+    """Append a series to dict-of-lists `columns` (same rows/order as series_to_rows); returns rows added."""
+    specs = SERIES_ROW_SPECS.get(kind)
+    if specs is None:
+        raise ValueError(f"Unsupported kind: {kind}")
     hours = payload.get("hours", [])
+    n = len(hours) * len(specs)
+    labels: List = []
+    indices: List = []
+    numeric: List = []
+    text: List = []
+    sections: List = []
+    measurements: List = []
+    types: List = []
+    units: List = []
+    for h in hours:
+        label = h.get("hour_label")
+        index = h.get("hour_index")
+        for section, measurement, mtype, unit, key, is_text in specs:
+            sections.append(section)
+            measurements.append(measurement)
+            types.append(mtype)
+            units.append(unit)
+            labels.append(label)
+            indices.append(index)
+            value = h.get(key)
+            numeric.append("" if is_text else value)
+            text.append(value if is_text else "")
+    columns["SourceFile"].extend([os.path.basename(source_file)] * n)
+    columns["Page"].extend([page_index + 1] * n)
+    columns["Location"].extend([location] * n)
+    columns["Section"].extend(sections)
+    columns["Measurement"].extend(measurements)
+    columns["MeasurementType"].extend(types)
+    columns["Units"].extend(units)
+    columns["ForecastWindowStartLocal"].extend([""] * n)
+    columns["HourLabel"].extend(labels)
+    columns["HourIndex"].extend(indices)
+    columns["TimestampLocal"].extend([""] * n)
+    columns["ValueNumeric"].extend(numeric)
+    columns["ValueText"].extend(text)
+    columns["Notes"].extend([""] * n)
+    return n
 
-    if kind == "wind":
-        for h in hours:
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Wind",
-                    "Measurement": "Wind",
-                    "MeasurementType": "Speed",
-                    "Units": "mph",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("wind_speed_mph"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Wind",
-                    "Measurement": "Wind",
-                    "MeasurementType": "Gust",
-                    "Units": "mph",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("wind_gust_mph"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Wind",
-                    "Measurement": "Wind",
-                    "MeasurementType": "Direction",
-                    "Units": "",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": "",
-                    "ValueText": h.get("wind_direction"),
-                    "Notes": "",
-                }
-            )
-
-    elif kind == "precipitation":
-        for h in hours:
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Precip",
-                    "Measurement": "Precipitation",
-                    "MeasurementType": "Rain",
-                    "Units": "mm",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("rain_mm"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Precip",
-                    "Measurement": "Precipitation",
-                    "MeasurementType": "Snow",
-                    "Units": "cm",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("snow_cm"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Precip",
-                    "Measurement": "Precipitation",
-                    "MeasurementType": "Type",
-                    "Units": "",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": "",
-                    "ValueText": h.get("precip_type"),
-                    "Notes": "",
-                }
-            )
-
-    elif kind == "temperature":
-        for h in hours:
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Temperature",
-                    "Measurement": "Temperature",
-                    "MeasurementType": "AirTemp_C",
-                    "Units": "degC",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("air_temp_c"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Temperature",
-                    "Measurement": "FreezingLevel",
-                    "MeasurementType": "FreezingLevel_m",
-                    "Units": "m",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("freezing_level_m"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-            rows.append(
-                {
-                    "SourceFile": os.path.basename(source_file),
-                    "Page": page_index + 1,
-                    "Location": location,
-                    "Section": "Temperature",
-                    "Measurement": "WetBulbFreezingLevel",
-                    "MeasurementType": "WBFL_m",
-                    "Units": "m",
-                    "ForecastWindowStartLocal": "",
-                    "HourLabel": h.get("hour_label"),
-                    "HourIndex": h.get("hour_index"),
-                    "TimestampLocal": "",
-                    "ValueNumeric": h.get("wet_bulb_freezing_level_m"),
-                    "ValueText": "",
-                    "Notes": "",
-                }
-            )
-    else:
-        raise ValueError(f"Unsupported kind: {kind}")
 
-    return rows
+def series_to_rows(
+    source_file: str,
+    page_index: int,
+    location: str,
+    kind: str,
+    payload: Dict,
+) -> List[Dict]:
+    columns = new_columns()
+    series_to_columns(columns, source_file, page_index, location, kind, payload)
+    return [dict(zip(ROW_COLUMNS, values)) for values in zip(*columns.values())]
 
 
-def rows_to_dataframe(rows: List[Dict]) -> pd.DataFrame:
+def rows_to_dataframe(rows: Union[List[Dict], Dict[str, List]]) -> pd.DataFrame:
+    """Accepts row dicts or columnar dict-of-lists (cheaper: no per-row dict handling)."""
     return pd.DataFrame(rows)
@@ -0,0 +1,55 @@
+import json
+from typing import Any, Callable
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover - optional SIMD JSON parser
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional faster JSON parsing
+    orjson = None
+
+# Decoder picked once at import, fastest available first: simdjson, then orjson, then the standard library.
+# All three accept str or bytes and raise ValueError subclasses on malformed input.
+if simdjson is not None:
+    BACKEND = "simdjson"
+    loads: Callable[[Any], Any] = simdjson.loads
+elif orjson is not None:
+    BACKEND = "orjson"
+    loads = orjson.loads
+else:
+    BACKEND = "json"
+    loads = json.loads
+
+
+# Compact UTF-8 encoder: orjson when installed, else the standard library. Both write non-ASCII raw, not \u-escaped,
+# so the bytes do not depend on which backend is installed.
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        # OPT_NON_STR_KEYS stringifies int keys the way the standard library does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Two-space indented UTF-8 JSON, laid out like json.dumps(obj, indent=2)."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS stringifies int keys the way the standard library does
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def line_loader() -> Callable[[bytes], Any]:
+    """Parser for many lines on one thread: a reused simdjson.Parser when available, else `loads`."""
+    if simdjson is None:
+        return loads
+    parser = simdjson.Parser()
+    # recursive=True hands back plain dicts/lists, so nothing holds on to the parser's buffer
+    return lambda line: parser.parse(line, recursive=True)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+MEMORY_MAX_ENTRIES = 256
+
+# Process-wide LRU shared by every LLMCache, so repeated pages/crops across PDFs skip disk reads too
+_memory: "OrderedDict[str, Any]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _memory_get(key: str) -> Optional[Any]:
+    with _memory_lock:
+        value = _memory.get(key)
+        if value is not None:
+            _memory.move_to_end(key)
+        return value
+
+
+def _memory_put(key: str, value: Any) -> None:
+    with _memory_lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def phash(img: Image.Image) -> int:
+    """64-bit perceptual hash: sign of the low-frequency 8x8 DCT block of a 32x32 grayscale thumbnail vs its median."""
+    small = np.asarray(img.convert("L").resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    low = (_DCT32 @ small @ _DCT32.T)[:8, :8].ravel()
+    bits = low > np.median(low)
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+class LLMCache:
+    """On-disk memo of LLM responses, one JSON file per content hash."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._fuzzy_path = os.path.join(cache_dir, "phash_index.jsonl")
+        self._fuzzy: Optional[Dict[str, List[Tuple[Tuple[int, ...], str]]]] = None
+        self._fuzzy_lock = threading.Lock()
+
+    @staticmethod
+    def key(images: Sequence[Image.Image], *parts: str) -> str:
+        h = hashlib.sha256()
+        for img in images:
+            h.update(img.tobytes())
+            h.update(f"{img.mode}:{img.size[0]}x{img.size[1]}".encode())
+        for part in parts:
+            h.update(b"\0" + part.encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        value = _memory_get(key)
+        if value is not None:
+            return value
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        _memory_put(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        _memory_put(key, value)
+        path = self._path(key)
+        # Write to a private temp file then rename, so concurrent readers never see a partial entry
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+    def _load_fuzzy(self) -> Dict[str, List[Tuple[Tuple[int, ...], str]]]:
+        if self._fuzzy is None:
+            index: Dict[str, List[Tuple[Tuple[int, ...], str]]] = {}
+            if os.path.exists(self._fuzzy_path):
+                with open(self._fuzzy_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        index.setdefault(entry["ns"], []).append((tuple(entry["phash"]), entry["key"]))
+            self._fuzzy = index
+        return self._fuzzy
+
+    def get_fuzzy(self, namespace: str, hashes: Sequence[int], max_dist: int = 3) -> Optional[Tuple[Any, int]]:
+        """Nearest cached value whose images are each within max_dist bits of `hashes`, with that distance."""
+        with self._fuzzy_lock:
+            entries = list(self._load_fuzzy().get(namespace, ()))
+        best: Optional[Tuple[int, str]] = None
+        for cached_hashes, key in entries:
+            if len(cached_hashes) != len(hashes):
+                continue
+            dist = max((a ^ b).bit_count() for a, b in zip(cached_hashes, hashes))
+            if dist <= max_dist and (best is None or dist < best[0]):
+                best = (dist, key)
+        if best is None:
+            return None
+        value = self.get(best[1])
+        return (value, best[0]) if value is not None else None
+
+    def put_fuzzy(self, namespace: str, hashes: Sequence[int], key: str) -> None:
+        with self._fuzzy_lock:
+            self._load_fuzzy().setdefault(namespace, []).append((tuple(hashes), key))
+            with open(self._fuzzy_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"ns": namespace, "phash": list(hashes), "key": key}) + "\n")
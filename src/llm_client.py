@@ -1,15 +1,45 @@
 import os
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
-from .models import RegionDetection, WindSeries, PrecipSeries, TempSeries, CombinedSeries, DirectionStrip, PrecipTypeStrip
+from openai import DefaultHttpxClient, OpenAI
+from .models import RegionDetection, WindSeries, PrecipSeries, TempSeries, DirectionStrip, PrecipTypeStrip, combined_model_for
 from .utils import pil_to_data_url
 
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with openai
+    httpx = None
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional HTTP/2 support
+    HTTP2_AVAILABLE = False
+
+COMBINED_ORDER = ("wind", "precipitation", "temperature")
+COMBINED_KIND_RULES = {
+    "wind": "- Wind: wind_speed_mph and wind_gust_mph as integer mph values aligned with the axis ticks, wind_direction using only the 16-point compass list provided. Keep gusts ≥ speeds.",
+    "precipitation": "- Precipitation: rain_mm to the nearest 0.1 mm (0.0 when the blue bar is absent), snow_cm with one decimal place, precip_type exactly as printed above each hour (no normalisation). Treat rainfall and snowfall bars as separate values for the same hour.",
+    "temperature": "- Temperature: air_temp_c to one decimal place, freezing_level_m and wet_bulb_freezing_level_m to the nearest 10 metres using the right-hand axis. Ignore static summit/elevation labels printed on the chart.",
+}
+_COUNT_WORDS = {1: "One", 2: "Two", 3: "Three"}
+
+# Bump whenever a prompt or response schema changes so cached responses are not reused.
+PROMPT_VERSION = "2"
+
+
+def _build_http_client(max_connections: int):
+    # Size the connection pool to the number of concurrent callers; multiplex over HTTP/2 when h2 is installed.
+    if httpx is None:
+        return None
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return DefaultHttpxClient(http2=HTTP2_AVAILABLE, limits=limits)
+
+
 class LLMClient:
-    def __init__(self, model: Optional[str] = None):
+    def __init__(self, model: Optional[str] = None, max_connections: int = 16):
         self.model = model or os.getenv("MODEL_NAME", "gpt-5")
-        self.client = OpenAI()
+        self.client = OpenAI(http_client=_build_http_client(max_connections))
 
     def _call_schema(
         self,
@@ -119,17 +149,20 @@ class LLMClient:
         )
         return self._call_schema(prompt, [crop_url], text_format, max_output_tokens=16_000)
 
-    def extract_all(self, crop_urls: Dict[str, str], text_format=CombinedSeries, feedback: str = "") -> Dict[str, Any]:
-        order = ["wind", "precipitation", "temperature"]
+    def extract_all(self, crop_urls: Dict[str, str], text_format=None, feedback: str = "") -> Dict[str, Any]:
+        # Any subset of the three graphs can be sent; images and keys follow the canonical order
+        order = [k for k in COMBINED_ORDER if k in crop_urls]
         images = [crop_urls[k] for k in order]
+        if text_format is None:
+            text_format = combined_model_for(tuple(order))
+        listing = ", ".join(f"({i}) {k} graph" for i, k in enumerate(order, start=1))
+        keys = ", ".join(f"'{k}'" for k in order)
         prompt = (
-            "Three images follow in order: (1) wind graph, (2) precipitation graph, (3) temperature graph.\n"
-            "Extract 24 hourly series for each and return a single object with keys 'wind', 'precipitation', 'temperature'. Use the same 'location' copied exactly from the shared graph title (no page footers or qualifiers; return an empty string if unreadable).\n"
+            f"{_COUNT_WORDS[len(order)]} images follow in order: {listing}.\n"
+            f"Extract 24 hourly series for each and return a single object with keys {keys}. Use the same 'location' copied exactly from the shared graph title (no page footers or qualifiers; return an empty string if unreadable).\n"
             "Before moving past the 18:00 hour, read each series directly from the grids to confirm the scale so later readings remain aligned.\n"
-            "- Wind: wind_speed_mph and wind_gust_mph as integer mph values aligned with the axis ticks, wind_direction using only the 16-point compass list provided. Keep gusts ≥ speeds.\n"
-            "- Precipitation: rain_mm to the nearest 0.1 mm (0.0 when the blue bar is absent), snow_cm with one decimal place, precip_type exactly as printed above each hour (no normalisation). Treat rainfall and snowfall bars as separate values for the same hour.\n"
-            "- Temperature: air_temp_c to one decimal place, freezing_level_m and wet_bulb_freezing_level_m to the nearest 10 metres using the right-hand axis. Ignore static summit/elevation labels printed on the chart.\n"
-            "All three series must contain exactly 24 entries covering hour_index 0..23 (hours 18→17). If data is unclear, estimate from neighbouring points and axis gridlines rather than omitting the hour.\n\n"
+            + "".join(COMBINED_KIND_RULES[k] + "\n" for k in order)
+            + f"All {_COUNT_WORDS[len(order)].lower()} series must contain exactly 24 entries covering hour_index 0..23 (hours 18→17). If data is unclear, estimate from neighbouring points and axis gridlines rather than omitting the hour.\n\n"
             + (f"Constraints/Corrections: {feedback}" if feedback else "")
         )
-        return self._call_schema(prompt, images, text_format, max_output_tokens=18_000)
+        return self._call_schema(prompt, images, text_format, max_output_tokens=6_000 * len(order))
@@ -21,9 +21,13 @@ def _to_gray_np(img: Image.Image, max_side: int = 1400) -> Tuple[np.ndarray, flo
     return arr, im.size[0] / img.size[0], im.size[1] / img.size[1]
 
 
-def _vertical_profile(arr: np.ndarray) -> np.ndarray:
+def _vertical_diff(arr: np.ndarray) -> np.ndarray:
+    # |Δv| edge map shared by the row profile and the per-band column bounds
+    return np.abs(np.diff(arr, axis=0, prepend=arr[[0], :]))
+
+
+def _vertical_profile(arr: np.ndarray, dv: np.ndarray) -> np.ndarray:
     # Edge-like measure: sum abs vertical and horizontal diffs
-    dv = np.abs(np.diff(arr, axis=0, prepend=arr[[0], :]))
     dh = np.abs(np.diff(arr, axis=1, prepend=arr[:, [0]]))
     e = dv + dh
     prof = e.mean(axis=1)
@@ -35,11 +39,23 @@ def _vertical_profile(arr: np.ndarray) -> np.ndarray:
     return prof
 
 
+def _sorted_percentile(sorted_prof: np.ndarray, pctl: float) -> float:
+    # Same linear interpolation as np.percentile, but on an already-sorted profile
+    pos = pctl / 100.0 * (len(sorted_prof) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_prof) - 1)
+    return float(sorted_prof[lo] + (sorted_prof[hi] - sorted_prof[lo]) * (pos - lo))
+
+
 def _find_segments(prof: np.ndarray, min_seg_h: int) -> List[Tuple[int, int]]:
     n = len(prof)
+    # Sort once and reuse one mask buffer across the threshold sweep
+    sorted_prof = np.sort(prof)
+    high = np.empty(n, dtype=bool)
+
     def high_mask(pctl: float) -> List[Tuple[int, int]]:
-        thr = np.percentile(prof, pctl)
-        high = prof > thr
+        thr = _sorted_percentile(sorted_prof, pctl)
+        np.greater(prof, thr, out=high)
         segs: List[Tuple[int, int]] = []
         in_seg = False
         start = 0
@@ -63,7 +79,7 @@ def _find_segments(prof: np.ndarray, min_seg_h: int) -> List[Tuple[int, int]]:
             return segs[:3]
 
     # Fallback: split by low-activity separators
-    thr_low = np.percentile(prof, 35)
+    thr_low = _sorted_percentile(sorted_prof, 35)
     low = prof < thr_low
     gaps: List[Tuple[int, int]] = []
     in_gap = False
@@ -89,16 +105,17 @@ def _find_segments(prof: np.ndarray, min_seg_h: int) -> List[Tuple[int, int]]:
     return segs[:3]
 
 
-def _horizontal_bounds(arr: np.ndarray, y0: int, y1: int) -> Tuple[int, int]:
-    band = arr[y0:y1, :]
-    col_prof = np.mean(np.abs(np.diff(band, axis=0, prepend=band[[0], :])), axis=0)
+def _horizontal_bounds(dv: np.ndarray, y0: int, y1: int) -> Tuple[int, int]:
+    # Column mean of the band's own vertical diffs: its first row diffs to itself (zero),
+    # so only rows y0+1..y1-1 of the shared edge map contribute.
+    col_prof = dv[y0 + 1:y1].sum(axis=0) / max(1, y1 - y0)
     thr = np.percentile(col_prof, 40)
     mask = col_prof > thr
     xs = np.where(mask)[0]
     if xs.size == 0:
-        return 0, arr.shape[1]
+        return 0, dv.shape[1]
     left = max(0, xs.min() - 5)
-    right = min(arr.shape[1], xs.max() + 5)
+    right = min(dv.shape[1], xs.max() + 5)
     return left, right
 
 
@@ -106,7 +123,8 @@ def detect_graphs_on_page_local(img: Image.Image) -> Dict:
     # Convert to grayscale and shrink for speed
     arr, sx, sy = _to_gray_np(img, max_side=1400)
     h, w = arr.shape
-    prof = _vertical_profile(arr)
+    dv = _vertical_diff(arr)
+    prof = _vertical_profile(arr, dv)
     # Expect sizable segments; require at least ~12% of page height
     min_seg_h = max(40, int(0.12 * h))
     segs = _find_segments(prof, min_seg_h)
@@ -131,7 +149,7 @@ def detect_graphs_on_page_local(img: Image.Image) -> Dict:
     kinds = ["wind", "precipitation", "temperature"]
     graphs = []
     for kind, (y0, y1) in zip(kinds, segs_sorted):
-        x0, x1 = _horizontal_bounds(arr, y0, y1)
+        x0, x1 = _horizontal_bounds(dv, y0, y1)
         # Normalize to original page
         nx = x0 / w
         ny = y0 / h
@@ -227,64 +227,31 @@ def process_pdf_local(pdf_path: Path) -> pd.DataFrame:
             ptypes = extract_precip_types(page)
             loc = extract_location(page, pdf_path)
 
-            for i, h in enumerate(HOUR_LABELS):
-                all_rows.extend(
-                    series_to_rows(
-                        pdf_path.name,
-                        page_idx,
-                        loc,
-                        "wind",
-                        {
-                            "hours": [
-                                {
-                                    "hour_label": h,
-                                    "hour_index": i,
-                                    "wind_speed_mph": speed[i],
-                                    "wind_gust_mph": gust[i],
-                                    "wind_direction": dir_vals[i],
-                                }
-                            ]
-                        },
-                    )
+            wind_hours: List[Dict] = []
+            precip_hours: List[Dict] = []
+            temp_hours: List[Dict] = []
+            for h, i, sp, gu, dv, rn, sn, pt, ar, fz, wb in zip(
+                HOUR_LABELS, range(24), speed, gust, dir_vals, rain, snow, ptypes, air, fl, wbfl
+            ):
+                wind_hours.append(
+                    {"hour_label": h, "hour_index": i, "wind_speed_mph": sp, "wind_gust_mph": gu, "wind_direction": dv}
                 )
-                all_rows.extend(
-                    series_to_rows(
-                        pdf_path.name,
-                        page_idx,
-                        loc,
-                        "precipitation",
-                        {
-                            "hours": [
-                                {
-                                    "hour_label": h,
-                                    "hour_index": i,
-                                    "rain_mm": rain[i],
-                                    "snow_cm": snow[i],
-                                    "precip_type": ptypes[i],
-                                }
-                            ]
-                        },
-                    )
+                precip_hours.append(
+                    {"hour_label": h, "hour_index": i, "rain_mm": rn, "snow_cm": sn, "precip_type": pt}
                 )
-                all_rows.extend(
-                    series_to_rows(
-                        pdf_path.name,
-                        page_idx,
-                        loc,
-                        "temperature",
-                        {
-                            "hours": [
-                                {
-                                    "hour_label": h,
-                                    "hour_index": i,
-                                    "air_temp_c": air[i],
-                                    "freezing_level_m": fl[i],
-                                    "wet_bulb_freezing_level_m": wbfl[i],
-                                }
-                            ]
-                        },
-                    )
+                temp_hours.append(
+                    {
+                        "hour_label": h,
+                        "hour_index": i,
+                        "air_temp_c": ar,
+                        "freezing_level_m": fz,
+                        "wet_bulb_freezing_level_m": wb,
+                    }
                 )
+            # One series_to_rows call per graph; rows are grouped by kind like the LLM pipelines emit them.
+            all_rows.extend(series_to_rows(pdf_path.name, page_idx, loc, "wind", {"hours": wind_hours}))
+            all_rows.extend(series_to_rows(pdf_path.name, page_idx, loc, "precipitation", {"hours": precip_hours}))
+            all_rows.extend(series_to_rows(pdf_path.name, page_idx, loc, "temperature", {"hours": temp_hours}))
         # Page 9 accumulations
         all_rows.extend(extract_page9_rows(pdf_path))
     finally:
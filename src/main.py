@@ -1,22 +1,90 @@
 import argparse
+import csv
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
+from PIL import Image
 from tqdm import tqdm
 
-from .pdf_render import render_pdf_to_images
+from .pdf_render import iter_pdf_pages, pdf_page_count
 from .extractors import (
     detect_graphs_on_page,
+    VALIDATORS,
+    batch_graphs,
+    encode_crop,
+    extract_all_series,
     extract_graph_series,
-    series_to_rows,
+    prepare_crop,
+    ROW_COLUMNS,
+    new_columns,
+    series_to_columns,
     rows_to_dataframe,
 )
-from .llm_client import LLMClient
+from .llm_cache import LLMCache, phash
+from .llm_client import PROMPT_VERSION, LLMClient
 from .local_detect import detect_graphs_on_page_local
-from .utils import crop_normalized_box, ensure_rgb, pil_to_data_url
-from .metrics import time_block, log_event
+from .utils import bytes_to_data_url, crop_normalized_box
+from .metrics import flush_metrics, time_block, log_event
+from .parse_batch_results import parse_detection_pages, parse_jsonl_file
+from .run_batch_pipeline import (
+    DEFAULT_KINDS,
+    build_detection_jsonl,
+    build_extraction_jsonl_from_detect,
+    build_pdf_lookup,
+    submit_and_wait,
+)
+
+
+class PageCsvWriter:
+    """Appends page row blocks to a CSV in page order, holding back only pages that finish early."""
+
+    def __init__(self, path: str, page_order: List[int]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f, lineterminator="\n")
+        self._writer.writerow(ROW_COLUMNS)
+        self._order = list(page_order)
+        self._next = 0
+        self._held: Dict[int, Dict[str, List]] = {}
+        self.rows = 0
+
+    def add(self, page: int, columns: Dict[str, List]) -> None:
+        self._held[page] = columns
+        while self._next < len(self._order) and self._order[self._next] in self._held:
+            block = self._held.pop(self._order[self._next])
+            self._next += 1
+            n = len(block["Page"])
+            if n:
+                self._writer.writerows(zip(*(block[c] for c in ROW_COLUMNS)))
+                self.rows += n
+        # Keep what is on disk current so a crash loses at most the in-flight pages
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def concat_csv_files(parts: List[Path], out_path: Path) -> int:
+    """Concatenate same-header CSVs on disk (header written once); returns the number of data rows."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    header_written = False
+    with open(out_path, "wb") as out:
+        for part in parts:
+            with open(part, "rb") as f:
+                header = f.readline()
+                if not header:
+                    continue
+                if not header_written:
+                    out.write(header)
+                    header_written = True
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    out.write(chunk)
+                    rows += chunk.count(b"\n")
+    return rows
 
 
 def process_pdf(
@@ -29,61 +97,316 @@ def process_pdf(
     max_page_px: int | None = 1400,
     max_crop_px: int | None = 1000,
     detect_method: str = "local",
+    workers: int = 16,
+    max_inflight_pages: int = 8,
+    on_rows: Callable[[int, Dict[str, List]], None] | None = None,
+    use_cache: bool = True,
+    extract_mode: str = "combined",
+    metrics_path: Optional[str] = None,
+    debug_crops: bool = False,
+    fuzzy_cache: bool = False,
+    client: Optional[LLMClient] = None,
+    csv_path: Optional[str] = None,
+    keep_rows: bool = True,
 ) -> pd.DataFrame:
-    client = LLMClient(model=model)
+    """Extract all graph series of a PDF.
+
+    With csv_path, rows are streamed to that CSV in page order as pages finish; keep_rows=False then
+    drops them after writing, so memory stays flat and the returned DataFrame is empty.
+    """
+    # Callers processing several PDFs pass one shared client so its connection pool stays warm
+    if client is None:
+        client = LLMClient(model=model, max_connections=workers)
     os.makedirs(out_dir, exist_ok=True)
-    metrics_path = os.path.join(out_dir, "metrics.jsonl")
-    pages = render_pdf_to_images(pdf_path, dpi=dpi, metrics_path=metrics_path)
-    all_rows: List[Dict] = []
+    metrics_path = metrics_path or os.path.join(out_dir, "metrics.jsonl")
+    cache = LLMCache(os.path.join(out_dir, ".llm_cache")) if use_cache else None
 
     # Heuristic for this document structure: pages 2..N-1 are area pages
     # but we still detect page_type via LLM to be safe.
     selected_pages = set(only_pages) if only_pages else None
     kinds_set = set(kinds_filter) if kinds_filter else None
-    total_pages = len(pages)
-    for i, img in enumerate(tqdm(pages, desc=f"Pages {os.path.basename(pdf_path)}")):
+    total_pages = pdf_page_count(pdf_path)
+    page_indices: List[int] = []
+    for i in range(total_pages):
         # Skip first/last by default (front page + back page not needed)
         if not selected_pages and (i + 1 in (1, total_pages)):
             continue
         if selected_pages and (i + 1) not in selected_pages:
             continue
+        page_indices.append(i)
+
+    def cached_call(
+        images: List[Image.Image],
+        parts: Tuple[str, ...],
+        compute: Callable[[], object],
+        fuzzy: bool = False,
+        **fields,
+    ):
+        # LLM responses are deterministic enough per (image, prompt, model) to reuse across reruns.
+        if cache is None:
+            return compute()
+        key = LLMCache.key(images, *parts, model, PROMPT_VERSION)
+        hit = cache.get(key)
+        if hit is not None:
+            log_event(metrics_path, {"type": "cache_hit", "file": pdf_path, **fields})
+            return hit
+        # Opt-in: reuse a response for crops that differ only by rendering noise (phash distance <= 3)
+        hashes: List[int] = []
+        namespace = ""
+        if fuzzy and fuzzy_cache:
+            hashes = [phash(im) for im in images]
+            namespace = "|".join((*parts, model, PROMPT_VERSION))
+            near = cache.get_fuzzy(namespace, hashes)
+            if near is not None:
+                log_event(metrics_path, {"type": "fuzzy_cache_hit", "file": pdf_path, "dist": near[1], **fields})
+                return near[0]
+        value = compute()
+        if value:
+            cache.put(key, value)
+            if hashes:
+                cache.put_fuzzy(namespace, hashes, key)
+        return value
+
+    def extract_cached(kind: str, crop: Image.Image, crop_url: str, page_num: int) -> Tuple[Dict, Dict]:
+        def compute():
+            payload, meta = extract_graph_series(
+                kind, crop, client, metrics_path=metrics_path, page_num=page_num, source_file=pdf_path, crop_url=crop_url
+            )
+            return [payload, meta] if payload else None
+
+        hit = cached_call([crop], ("extract", kind, str(max_crop_px)), compute, fuzzy=True, page=page_num, kind=kind)
+        if hit is None:
+            return {}, {}
+        payload, meta = hit
+        return payload, meta
+
+    def extract_all_cached(crop_map: Dict[str, Image.Image], crop_urls: Dict[str, str], page_num: int) -> Tuple[Dict, Dict]:
+        def compute():
+            payload, meta = extract_all_series(
+                crop_map, client, metrics_path=metrics_path, page_num=page_num, source_file=pdf_path, crop_urls=crop_urls
+            )
+            return [payload, meta] if payload else None
+
+        kinds = list(crop_map)
+        images = [crop_map[k] for k in kinds]
+        hit = cached_call(
+            images, ("extract_all", ",".join(kinds), str(max_crop_px)), compute, fuzzy=True, page=page_num, kind="combined"
+        )
+        if hit is None:
+            return {}, {}
+        payload, meta = hit
+        return payload, meta
+
+    def process_page(i: int, img: Image.Image, extract_pool: ThreadPoolExecutor) -> Dict[str, List]:
         # Skip page 1 and last if you want; but ask the model to confirm
         with time_block("page_processing", metrics_path, file=pdf_path, page=i + 1):
-            # detect method is passed via closure variable 'detect_method' set by main()
             if detect_method == "local":
                 regions = detect_graphs_on_page_local(img)
             else:
-                regions = detect_graphs_on_page(
-                    img, client, desired_kinds=kinds_set, metrics_path=metrics_path, page_num=i + 1, source_file=pdf_path, max_page_px=max_page_px
+                regions = cached_call(
+                    [img],
+                    ("detect", ",".join(sorted(kinds_set or ())), str(max_page_px)),
+                    lambda: detect_graphs_on_page(
+                        img, client, desired_kinds=kinds_set, metrics_path=metrics_path, page_num=i + 1, source_file=pdf_path, max_page_px=max_page_px
+                    ),
+                    page=i + 1,
+                    kind="detect",
                 )
         if regions.get("page_type") != "area_graphs":
-            continue
+            return new_columns()
 
         location = regions.get("location") or ""
         graphs = regions.get("graphs", [])
-        # Optionally save debug with crops
         page_out = Path(out_dir) / f"{Path(pdf_path).stem}_page_{i+1}"
-        page_out.mkdir(parents=True, exist_ok=True)
+        if debug_crops:
+            page_out.mkdir(parents=True, exist_ok=True)
 
-        # For best per-graph accuracy, use individual per-graph extraction calls (slower but higher fidelity)
+        # Crops are resized and JPEG-encoded once; the same bytes feed the upload and the debug file
+        crops: List[Tuple[str, Image.Image]] = []
+        crop_urls: Dict[str, str] = {}
         for g in graphs:
             kind = g.get("kind")
             if kinds_set and kind not in kinds_set:
                 continue
             bbox = g.get("bbox")
             with time_block("crop_graph", metrics_path, file=pdf_path, page=i + 1, kind=kind):
-                crop = crop_normalized_box(img, tuple(bbox))
-            crop.save(page_out / f"crop_{kind}.png")
-            payload, meta = extract_graph_series(
-                kind, crop, client, metrics_path=metrics_path, page_num=i + 1, source_file=pdf_path, max_crop_px=max_crop_px
-            )
+                crop = prepare_crop(crop_normalized_box(img, bbox, max_crop_px), max_crop_px)
+                data = encode_crop(crop)
+            if debug_crops:
+                (page_out / f"crop_{kind}.jpg").write_bytes(data)
+            crop_urls[kind] = bytes_to_data_url(data, format="JPEG")
+            crops.append((kind, crop))
+
+        # Combined mode packs the page's graphs into as few multi-image calls as fit; any kind that
+        # still fails validation (or per-graph mode) falls back to one call per graph for higher fidelity.
+        results: Dict[str, Tuple[Dict, Dict]] = {}
+        crop_map = dict(crops)
+        packs = batch_graphs(crop_map, max_crop_px=max_crop_px) if extract_mode == "combined" else []
+        # All of the page's calls go to the shared pool up front so they are in flight together
+        pack_futures = [
+            (pack, extract_pool.submit(extract_all_cached, {k: crop_map[k] for k in pack}, {k: crop_urls[k] for k in pack}, i + 1))
+            for pack in packs
+            if len(pack) > 1
+        ]
+        packed = {k for pack, _ in pack_futures for k in pack}
+        futures = {
+            kind: extract_pool.submit(extract_cached, kind, crop, crop_urls[kind], i + 1)
+            for kind, crop in crops
+            if kind not in packed
+        }
+        for pack, fut in pack_futures:
+            combined, meta = fut.result()
+            for kind in pack:
+                payload = combined.get(kind) or {}
+                if payload and VALIDATORS[kind](payload)[0]:
+                    if combined.get("location") and not payload.get("location"):
+                        payload = {**payload, "location": combined["location"]}
+                    results[kind] = (payload, meta)
+                else:
+                    log_event(metrics_path, {"type": "combined_fallback", "file": pdf_path, "page": i + 1, "kind": kind})
+                    futures[kind] = extract_pool.submit(extract_cached, kind, crop_map[kind], crop_urls[kind], i + 1)
+
+        page_columns = new_columns()
+        # Consume in graph order so location carry-over within a page matches the serial flow
+        for kind, _ in crops:
+            payload, meta = results[kind] if kind in results else futures[kind].result()
             if payload.get("location"):
                 location = payload["location"]
-            rows = series_to_rows(pdf_path, i, location, kind, payload)
-            all_rows.extend(rows)
-            log_event(metrics_path, {"type": "rows_added", "file": pdf_path, "page": i + 1, "kind": kind, "rows": len(rows), "retry": bool(meta.get("retry"))})
+            added = series_to_columns(page_columns, pdf_path, i, location, kind, payload)
+            log_event(metrics_path, {"type": "rows_added", "file": pdf_path, "page": i + 1, "kind": kind, "rows": added, "retry": bool(meta.get("retry"))})
+        return page_columns
+
+    # The OpenAI client releases the GIL while waiting on HTTP, so threads give real request
+    # concurrency: up to max_inflight_pages pages detect at once, and their graph extractions
+    # share a pool of `workers` in-flight calls.
+    columns_by_page: Dict[int, Dict[str, List]] = {}
+    csv_writer = PageCsvWriter(csv_path, page_indices) if csv_path else None
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as extract_pool, ThreadPoolExecutor(
+        max_workers=max(1, max_inflight_pages)
+    ) as page_pool:
+        pending: Dict = {}
+        progress = tqdm(total=len(page_indices), desc=f"Pages {os.path.basename(pdf_path)}")
+
+        def collect_one() -> None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = pending.pop(fut)
+                columns = fut.result()
+                progress.update(1)
+                if csv_writer is not None:
+                    csv_writer.add(i, columns)
+                if on_rows and columns["Page"]:
+                    on_rows(i + 1, columns)
+                if keep_rows:
+                    columns_by_page[i] = columns
+
+        # Only selected pages are rasterized, and at most max_inflight_pages of them are alive at once
+        page_nums = [i + 1 for i in page_indices]
+        for page_num, img in iter_pdf_pages(pdf_path, dpi=dpi, pages=page_nums, metrics_path=metrics_path):
+            while len(pending) >= max(1, max_inflight_pages):
+                collect_one()
+            pending[page_pool.submit(process_page, page_num - 1, img, extract_pool)] = page_num - 1
+            del img
+        while pending:
+            collect_one()
+        progress.close()
+    if csv_writer is not None:
+        csv_writer.close()
+
+    # Columnar assembly in page order: one list extend per column instead of a dict per row
+    all_columns = new_columns()
+    for i in sorted(columns_by_page):
+        for name, values in columns_by_page[i].items():
+            all_columns[name].extend(values)
+    flush_metrics()
+    return rows_to_dataframe(all_columns)
+
+
+_worker_client: Optional[LLMClient] = None
+
+
+def _init_pdf_worker(model: str, max_connections: int) -> None:
+    # One client (and HTTP connection pool) per worker process, reused for every PDF it handles
+    global _worker_client
+    _worker_client = LLMClient(model=model, max_connections=max_connections)
+
 
-    return rows_to_dataframe(all_rows)
+def _process_pdf_worker(pdf_path: str, out_dir: str, model: str, kwargs: Dict[str, Any]) -> None:
+    # Per-process metrics file avoids interleaved appends; summarize_metrics merges them
+    metrics_path = os.path.join(out_dir, f"metrics.{os.getpid()}.jsonl")
+    process_pdf(pdf_path, out_dir, model, metrics_path=metrics_path, client=_worker_client, **kwargs)
+
+
+def process_pdfs_batch(
+    pdf_paths: List[str],
+    out_dir: str,
+    model: str,
+    dpi: int = 300,
+    only_pages: List[int] | None = None,
+    kinds_filter: List[str] | None = None,
+    max_page_px: int | None = 1400,
+    max_crop_px: int | None = 1000,
+    detect_method: str = "local",
+    poll_interval: int = 20,
+) -> pd.DataFrame:
+    """Same detection/extraction as process_pdf, but submitted through the Batch API.
+
+    Trades latency (up to the 24h completion window) for roughly half the per-token cost.
+    """
+    from openai import OpenAI
+
+    client = OpenAI()
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    pdfs = [Path(p).resolve() for p in pdf_paths]
+    selected = set(only_pages) if only_pages else None
+
+    if detect_method == "local":
+        detection_map: Dict[str, Dict[int, Dict]] = {}
+        for pdf in pdfs:
+            total = pdf_page_count(str(pdf))
+            wanted = sorted(selected) if selected is not None else range(2, total)
+            for i, img in iter_pdf_pages(str(pdf), dpi=dpi, pages=wanted):
+                regions = detect_graphs_on_page_local(img)
+                if regions.get("page_type") != "area_graphs":
+                    continue
+                detection_map.setdefault(pdf.name, {})[i] = {
+                    "location": regions.get("location") or "",
+                    "graphs": regions.get("graphs") or [],
+                }
+    else:
+        detect_jsonl = out / "batch_detect.jsonl"
+        detect_results = out / "batch_detect_results.jsonl"
+        build_detection_jsonl(model, pdfs, detect_jsonl, dpi=dpi, max_page_px=max_page_px)
+        submit_and_wait(client, detect_jsonl, detect_results, poll_interval=poll_interval)
+        detection_map = parse_detection_pages([detect_results])
+        if selected is not None:
+            detection_map = {
+                name: {p: d for p, d in pages.items() if p in selected} for name, pages in detection_map.items()
+            }
+
+    extract_jsonl = out / "batch_extract.jsonl"
+    extract_results = out / "batch_extract_results.jsonl"
+    build_extraction_jsonl_from_detect(
+        model,
+        detection_map,
+        build_pdf_lookup(pdfs),
+        extract_jsonl,
+        dpi=dpi,
+        max_crop_px=max_crop_px,
+        kinds=kinds_filter or DEFAULT_KINDS,
+        prefer_combined=False,
+    )
+    submit_and_wait(client, extract_jsonl, extract_results, poll_interval=poll_interval)
+
+    detection_locations = {
+        (name, page): data.get("location") or ""
+        for name, pages in detection_map.items()
+        for page, data in pages.items()
+        if data.get("location")
+    } or None
+    rows = parse_jsonl_file(str(extract_results), detection_locations=detection_locations)
+    return rows_to_dataframe(rows)
 
 
 def main():
@@ -96,6 +419,33 @@ def main():
     parser.add_argument("--max_page_px", type=int, default=1400, help="Max page image side for detection (default: 1400)")
     parser.add_argument("--max_crop_px", type=int, default=1000, help="Max crop image side for extraction (default: 1000)")
     parser.add_argument("--detect", choices=["local", "llm"], default="llm", help="Region detection method (default: llm)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent extraction requests per PDF (default: 16)")
+    parser.add_argument("--max_inflight_pages", type=int, default=8, help="Pages detected/extracted concurrently per PDF (default: 8)")
+    parser.add_argument(
+        "--pdf_workers",
+        type=int,
+        default=0,
+        help="PDFs processed in parallel worker processes (default: min(#PDFs, CPU count); 1 = in-process)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["combined", "per-graph"],
+        default="combined",
+        help="One LLM call for all three graphs per page, or one call per graph (default: combined)",
+    )
+    parser.add_argument("--debug_crops", action="store_true", help="Save each uploaded graph crop under out_dir for inspection")
+    parser.add_argument(
+        "--fuzzy_cache",
+        action="store_true",
+        help="Also reuse cached extractions for near-identical crops (perceptual hash within 3 bits)",
+    )
+    parser.add_argument("--no_cache", action="store_true", help="Ignore and do not populate the on-disk LLM response cache")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all requests through the OpenAI Batch API (cheaper, up to 24h turnaround)",
+    )
+    parser.add_argument("--poll_interval", type=int, default=20, help="Batch status poll interval in seconds (default: 20)")
     parser.add_argument(
         "--pages",
         type=str,
@@ -114,7 +464,6 @@ def main():
     if not inputs:
         inputs = [str(p) for p in Path(".").glob("*.pdf")]
 
-    frames: List[pd.DataFrame] = []
     # Parse page and kind filters
     only_pages: List[int] | None = None
     if args.pages:
@@ -135,11 +484,12 @@ def main():
         if kinds_list:
             kinds_filter = kinds_list
 
-    for pdf in inputs:
-        if not pdf.lower().endswith(".pdf"):
-            continue
-        df = process_pdf(
-            pdf,
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    csv_parts: List[Path] = []
+    if args.batch:
+        df = process_pdfs_batch(
+            [p for p in inputs if p.lower().endswith(".pdf")],
             args.out_dir,
             args.model,
             dpi=args.dpi,
@@ -148,22 +498,62 @@ def main():
             max_page_px=args.max_page_px,
             max_crop_px=args.max_crop_px,
             detect_method=args.detect,
+            poll_interval=args.poll_interval,
         )
-        frames.append(df)
-        # Write per-PDF CSV chunk for long runs
-        stem = Path(pdf).stem
-        per_pdf_csv = Path(args.out_dir) / f"{stem}_extracted.csv"
-        df.to_csv(per_pdf_csv, index=False)
-        print(f"Wrote per-PDF rows: {len(df)} to {per_pdf_csv}")
-
-    if frames:
-        out_df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        batch_csv = out_dir / "batch_extracted.csv"
+        df.reindex(columns=ROW_COLUMNS).to_csv(batch_csv, index=False)
+        csv_parts.append(batch_csv)
+        inputs = []
+
+    pdfs = [pdf for pdf in inputs if pdf.lower().endswith(".pdf")]
+    pdf_kwargs: Dict[str, Any] = dict(
+        dpi=args.dpi,
+        only_pages=only_pages,
+        kinds_filter=kinds_filter,
+        max_page_px=args.max_page_px,
+        max_crop_px=args.max_crop_px,
+        detect_method=args.detect,
+        workers=args.workers,
+        max_inflight_pages=args.max_inflight_pages,
+        use_cache=not args.no_cache,
+        extract_mode=args.mode,
+        debug_crops=args.debug_crops,
+        fuzzy_cache=args.fuzzy_cache,
+        keep_rows=False,
+    )
+    # Per-PDF CSVs are streamed page by page while extracting, so long runs keep their progress
+    per_pdf_csvs = {pdf: out_dir / f"{Path(pdf).stem}_extracted.csv" for pdf in pdfs}
+
+    def report_per_pdf(pdf: str) -> None:
+        with open(per_pdf_csvs[pdf], "rb") as f:
+            rows = max(0, sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b"")) - 1)
+        print(f"Wrote per-PDF rows: {rows} to {per_pdf_csvs[pdf]}")
+
+    pdf_workers = args.pdf_workers or min(len(pdfs), os.cpu_count() or 1)
+    if pdf_workers <= 1 or len(pdfs) <= 1:
+        client = LLMClient(model=args.model, max_connections=args.workers)
+        for pdf in pdfs:
+            process_pdf(pdf, args.out_dir, args.model, client=client, csv_path=str(per_pdf_csvs[pdf]), **pdf_kwargs)
+            report_per_pdf(pdf)
     else:
-        out_df = pd.DataFrame()
+        # PDFs are independent; separate processes keep rendering and local detection off one GIL
+        with ProcessPoolExecutor(
+            max_workers=pdf_workers, initializer=_init_pdf_worker, initargs=(args.model, args.workers)
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _process_pdf_worker, pdf, args.out_dir, args.model, {**pdf_kwargs, "csv_path": str(per_pdf_csvs[pdf])}
+                ): pdf
+                for pdf in pdfs
+            }
+            for fut in as_completed(futures):
+                fut.result()
+                report_per_pdf(futures[fut])
+    csv_parts.extend(per_pdf_csvs[pdf] for pdf in pdfs)
 
-    Path(args.out_csv).parent.mkdir(parents=True, exist_ok=True)
-    out_df.to_csv(args.out_csv, index=False)
-    print(f"Wrote {len(out_df)} rows to {args.out_csv}")
+    # Concatenate on disk rather than holding every PDF's rows for a pd.concat
+    total = concat_csv_files(csv_parts, Path(args.out_csv))
+    print(f"Wrote {total} rows to {args.out_csv}")
     # Print metrics summary
     metrics_path = os.path.join(args.out_dir, "metrics.jsonl")
     try:
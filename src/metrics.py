@@ -1,22 +1,109 @@
+import atexit
+import glob
 import json
 import os
+import threading
 import time
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from .jsonio import loads as _loads
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+class MetricsLogger:
+    """Keeps one buffered append handle per metrics file instead of reopening it for every event."""
+
+    FLUSH_EVERY = 50
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handles: Dict[str, IO[str]] = {}
+        self._pending: Dict[str, int] = {}
+
+    def log(self, path: str, event: Dict) -> None:
+        self.write(path, {"ts": _now_iso(), **event})
+
+    def write(self, path: str, record: Dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            f = self._handles.get(path)
+            if f is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                f = self._handles[path] = open(path, "a", encoding="utf-8")
+            f.write(line)
+            pending = self._pending.get(path, 0) + 1
+            if pending >= self.FLUSH_EVERY:
+                f.flush()
+                pending = 0
+            self._pending[path] = pending
+
+    def flush(self) -> None:
+        with self._lock:
+            for f in self._handles.values():
+                f.flush()
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            for f in self._handles.values():
+                f.close()
+            self._handles.clear()
+            self._pending.clear()
+
+    def _after_fork_in_child(self) -> None:
+        # Buffers were flushed before the fork; drop the inherited handles and lock
+        self._lock = threading.Lock()
+        self._handles = {}
+        self._pending = {}
+
+
+_logger = MetricsLogger()
+atexit.register(_logger.close)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_logger.flush, after_in_child=_logger._after_fork_in_child)
+
+
+# Per-thread event list set by captured_events(); while set, log_event appends there instead of writing
+_capture = threading.local()
+
+
 def log_event(path: Optional[str], event: Dict) -> None:
     if not path:
         return
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    evt = {"ts": _now_iso(), **event}
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(evt) + "\n")
+    captured = getattr(_capture, "events", None)
+    if captured is not None:
+        captured.append((path, {"ts": _now_iso(), **event}))
+        return
+    _logger.log(path, event)
+
+
+@contextmanager
+def captured_events() -> Iterator[List[Tuple[str, Dict]]]:
+    """Collect this thread's events in memory instead of writing them.
+
+    Pool workers return the list so the parent writes it with write_events, and only one process appends to each file.
+    """
+    previous = getattr(_capture, "events", None)
+    _capture.events = events = []
+    try:
+        yield events
+    finally:
+        _capture.events = previous
+
+
+def write_events(events: List[Tuple[str, Dict]]) -> None:
+    for path, record in events:
+        _logger.write(path, record)
+
+
+def flush_metrics() -> None:
+    """Write out buffered events; needed in pool workers, which exit without running atexit hooks."""
+    _logger.flush()
 
 
 @contextmanager
@@ -30,7 +117,12 @@ def time_block(name: str, metrics_path: Optional[str] = None, **fields):
 
 
 def summarize_metrics(path: str) -> str:
-    if not os.path.exists(path):
+    flush_metrics()
+    # Parallel runs write one metrics.<pid>.jsonl per worker process next to the main file
+    root, ext = os.path.splitext(path)
+    paths = [path] + sorted(glob.glob(f"{glob.escape(root)}.*{ext}"))
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
         return "No metrics found."
     import collections
 
@@ -38,19 +130,22 @@ def summarize_metrics(path: str) -> str:
     totals = collections.defaultdict(float)
     per_page = collections.defaultdict(float)
 
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                evt = json.loads(line)
-            except Exception:
-                continue
-            t = evt.get("type")
-            d = float(evt.get("duration_s", 0.0) or 0.0)
-            counts[t] += 1
-            totals[t] += d
-            if t in ("page_processing",):
-                key = (evt.get("file"), evt.get("page"))
-                per_page[key] += d
+    for metrics_file in paths:
+        # Binary lines go straight to the parser; lines without a type field are skipped unparsed
+        with open(metrics_file, "rb") as f:
+            for line in f:
+                if b'"type":' not in line:
+                    continue
+                try:
+                    evt = _loads(line)
+                except ValueError:
+                    continue
+                t = evt.get("type")
+                d = float(evt.get("duration_s", 0.0) or 0.0)
+                counts[t] += 1
+                totals[t] += d
+                if t == "page_processing":
+                    per_page[(evt.get("file"), evt.get("page"))] += d
 
     def fmt(s: float) -> str:
         return f"{s:.1f}s"
@@ -1,20 +1,40 @@
-from typing import List, Literal, Optional
-from pydantic import BaseModel, Field, field_validator
+from functools import lru_cache
+from typing import Annotated, List, Literal, Optional, Tuple, Type
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, create_model
 
 
-class GraphRegion(BaseModel):
+_HOUR_LABEL_PATTERN = r"^(18|19|2[0-3]|0[0-9]|1[0-7])$"
+_VALID_HOUR_LABELS = frozenset(["18", "19", "20", "21", "22", "23"] + [f"{h:02d}" for h in range(18)])
+
+
+def _check_hour_label(v: str) -> str:
+    if v not in _VALID_HOUR_LABELS:
+        raise ValueError(f"String should match pattern '{_HOUR_LABEL_PATTERN}'")
+    return v
+
+
+# Set lookup instead of a regex match; the pattern is still published in the JSON schema for the LLM
+HourLabel = Annotated[str, AfterValidator(_check_hour_label), Field(json_schema_extra={"pattern": _HOUR_LABEL_PATTERN})]
+
+
+class _Model(BaseModel):
+    # LLM responses are read-only records; unknown keys are rejected in the core validator
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class GraphRegion(_Model):
     kind: Literal["wind", "precipitation", "temperature"]
     bbox: List[float] = Field(..., min_length=4, max_length=4)
 
 
-class RegionDetection(BaseModel):
+class RegionDetection(_Model):
     page_type: Literal["area_graphs", "other"]
     location: Optional[str] = None
     graphs: List[GraphRegion]
 
 
-class WindHour(BaseModel):
-    hour_label: str = Field(pattern=r"^(18|19|2[0-3]|0[0-9]|1[0-7])$")
+class WindHour(_Model):
+    hour_label: HourLabel
     hour_index: int = Field(ge=0, le=23)
     wind_speed_mph: float = Field(ge=0, le=150)
     wind_gust_mph: float = Field(ge=0, le=200)
@@ -23,20 +43,13 @@ class WindHour(BaseModel):
     ]
 
 
-class WindSeries(BaseModel):
+class WindSeries(_Model):
     location: Optional[str] = None
-    hours: List[WindHour]
+    hours: List[WindHour] = Field(min_length=24, max_length=24)
 
-    @field_validator("hours")
-    @classmethod
-    def _validate_24(cls, v: List[WindHour]):
-        if len(v) != 24:
-            raise ValueError("Expected 24 hourly entries for wind")
-        return v
 
-
-class PrecipHour(BaseModel):
-    hour_label: str = Field(pattern=r"^(18|19|2[0-3]|0[0-9]|1[0-7])$")
+class PrecipHour(_Model):
+    hour_label: HourLabel
     hour_index: int = Field(ge=0, le=23)
     rain_mm: float = Field(ge=0, le=100)
     snow_cm: float = Field(ge=0, le=100)
@@ -68,7 +81,7 @@ class PrecipHour(BaseModel):
     ]
 
 
-class DirectionStrip(BaseModel):
+class DirectionStrip(_Model):
     directions: List[
         Literal[
             "N",
@@ -88,17 +101,10 @@ class DirectionStrip(BaseModel):
             "NW",
             "NNW",
         ]
-    ]
+    ] = Field(min_length=24, max_length=24)
 
-    @field_validator("directions")
-    @classmethod
-    def _validate_24(cls, v: List[str]):
-        if len(v) != 24:
-            raise ValueError("Expected 24 direction labels (hours 18→17)")
-        return v
 
-
-class PrecipTypeStrip(BaseModel):
+class PrecipTypeStrip(_Model):
     precip_types: List[
         Literal[
             "Clear",
@@ -114,50 +120,47 @@ class PrecipTypeStrip(BaseModel):
             "Drizzle",
             "Overcast",
         ]
-    ]
-
-    @field_validator("precip_types")
-    @classmethod
-    def _validate_24(cls, v: List[str]):
-        if len(v) != 24:
-            raise ValueError("Expected 24 precip type labels (hours 18→17)")
-        return v
+    ] = Field(min_length=24, max_length=24)
 
 
-class PrecipSeries(BaseModel):
+class PrecipSeries(_Model):
     location: Optional[str] = None
-    hours: List[PrecipHour]
+    hours: List[PrecipHour] = Field(min_length=24, max_length=24)
 
-    @field_validator("hours")
-    @classmethod
-    def _validate_24(cls, v: List[PrecipHour]):
-        if len(v) != 24:
-            raise ValueError("Expected 24 hourly entries for precipitation")
-        return v
 
-
-class TempHour(BaseModel):
-    hour_label: str = Field(pattern=r"^(18|19|2[0-3]|0[0-9]|1[0-7])$")
+class TempHour(_Model):
+    hour_label: HourLabel
     hour_index: int = Field(ge=0, le=23)
     air_temp_c: float = Field(ge=-50, le=20)
     freezing_level_m: float = Field(ge=0, le=6000)
     wet_bulb_freezing_level_m: float = Field(ge=0, le=6000)
 
 
-class TempSeries(BaseModel):
+class TempSeries(_Model):
     location: Optional[str] = None
-    hours: List[TempHour]
-
-    @field_validator("hours")
-    @classmethod
-    def _validate_24(cls, v: List[TempHour]):
-        if len(v) != 24:
-            raise ValueError("Expected 24 hourly entries for temperature")
-        return v
+    hours: List[TempHour] = Field(min_length=24, max_length=24)
 
 
-class CombinedSeries(BaseModel):
+class CombinedSeries(_Model):
     location: Optional[str] = None
     wind: WindSeries
     precipitation: PrecipSeries
     temperature: TempSeries
+
+
+SERIES_MODELS = {
+    "wind": WindSeries,
+    "precipitation": PrecipSeries,
+    "temperature": TempSeries,
+}
+
+
+@lru_cache(maxsize=None)
+def combined_model_for(kinds: Tuple[str, ...]) -> Type[BaseModel]:
+    """CombinedSeries restricted to the given kinds, for pages where only some graphs were detected."""
+    if set(kinds) == set(SERIES_MODELS):
+        return CombinedSeries
+    fields = {k: (SERIES_MODELS[k], ...) for k in kinds}
+    return create_model(
+        "CombinedSeries_" + "_".join(kinds), __base__=_Model, location=(Optional[str], None), **fields
+    )
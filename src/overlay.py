@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -10,20 +11,26 @@ COLORS = {
 }
 
 
-def draw_bboxes(img: Image.Image, graphs: List[Dict], out_path: str) -> None:
-    im = img.convert("RGB").copy()
-    W, H = im.size
-    draw = ImageDraw.Draw(im)
+def draw_bboxes(img: Image.Image, graphs: List[Dict], out_path: str, width: int = 4) -> None:
+    # np.array gives one writable RGB copy; each box outline is then four slice stores
+    arr = np.array(img if img.mode == "RGB" else img.convert("RGB"))
+    H, W = arr.shape[:2]
+    labels = []
     for g in graphs:
         kind = g.get("kind", "")
         color = COLORS.get(kind, (255, 215, 0))
         x, y, w, h = g.get("bbox", [0, 0, 1, 1])
-        L = int(x * W)
-        T = int(y * H)
-        R = int((x + w) * W)
-        B = int((y + h) * H)
-        draw.rectangle([L, T, R, B], outline=color, width=4)
-        label = kind or "graph"
-        draw.text((L + 6, T + 6), label, fill=color)
+        L = max(0, min(W, int(x * W)))
+        T = max(0, min(H, int(y * H)))
+        R = max(0, min(W, int((x + w) * W)))
+        B = max(0, min(H, int((y + h) * H)))
+        arr[T:T + width, L:R] = color
+        arr[max(T, B - width):B, L:R] = color
+        arr[T:B, L:L + width] = color
+        arr[T:B, max(L, R - width):R] = color
+        labels.append(((L + 6, T + 6), kind or "graph", color))
+    im = Image.fromarray(arr)
+    draw = ImageDraw.Draw(im)
+    for pos, label, color in labels:
+        draw.text(pos, label, fill=color)
     im.save(out_path)
-
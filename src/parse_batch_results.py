@@ -1,53 +1,95 @@
 import argparse
-import json
+import csv
+import mmap
 import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
-
-import pandas as pd
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .aggregation import normalize_location_string
-from .extractors import series_to_rows
+from .extractors import ROW_COLUMNS, series_to_rows
+from .jsonio import line_loader
+from .jsonio import loads as _text_loads
+
+# Files smaller than this are parsed in-process; sharding only pays off once parsing outweighs worker startup
+SHARD_MIN_BYTES = 8 * 1024 * 1024
+
+
+def iter_jsonl(
+    path: os.PathLike[str] | str,
+    on_error: Optional[Callable[[int, ValueError], None]] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """Yield (line_number, object) for each non-blank JSONL line; malformed lines go to on_error and are skipped.
+
+    start/end restrict reading to a byte range that must begin on a line boundary; line numbers count from start.
+    """
+    loads = line_loader()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        # Map the file and hint sequential access so the kernel reads ahead of the parser
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            stop = len(mm) if end is None else end
+            mm.seek(start)
+
+            def read_line() -> bytes:
+                return mm.readline() if mm.tell() < stop else b""
+
+            for line_number, line in enumerate(iter(read_line, b""), start=1):
+                # Both parsers accept surrounding whitespace, so only blank lines need filtering
+                if line.isspace():
+                    continue
+                try:
+                    obj = loads(line)
+                except ValueError as exc:
+                    if on_error is not None:
+                        on_error(line_number, exc)
+                    continue
+                yield line_number, obj
+
+
+_PARSED_KEYS = ("parsed", "json")
+_TEXT_TYPES = frozenset(("output_text", "text"))
 
 
 def extract_structured_output(resp: Dict) -> Optional[Dict]:
     # Prefer 'output_parsed' when present
-    if "output_parsed" in resp and resp["output_parsed"] is not None:
-        return resp["output_parsed"]
-    # Else scan output list
-    out = resp.get("output") or []
-    for item in out:
-        contents = item.get("content") or []
-        for c in contents:
-            if "parsed" in c and isinstance(c["parsed"], dict):
-                return c["parsed"]
-            if "json" in c and isinstance(c["json"], dict):
-                return c["json"]
-            # Try to parse text as JSON
-            if c.get("type") in ("output_text", "text"):
-                txt = c.get("text", "")
+    parsed = resp.get("output_parsed")
+    if parsed is not None:
+        return parsed
+    # Else scan output list: a dict under 'parsed'/'json' wins, then text blocks are tried as JSON
+    loads = _text_loads
+    for item in resp.get("output") or ():
+        for c in item.get("content") or ():
+            for k in _PARSED_KEYS:
+                v = c.get(k)
+                if isinstance(v, dict):
+                    return v
+            if c.get("type") in _TEXT_TYPES:
                 try:
-                    return json.loads(txt)
+                    return loads(c.get("text", ""))
                 except Exception:
                     continue
     return None
 
 
+# custom_id formats: extract::<file name>::p{page}::{kind} and detect::<file name>::p{page}
+EXTRACT_ID_RE = re.compile(r"extract::(.+?)::[pP](\d+)::(\w+)")
+_DETECT_ID_RE = re.compile(r"detect::(.+?)::[pP](\d+)")
+
+
 def parse_custom_id(custom_id: str) -> Dict:
-    # Format: extract::<file name>::p{page}::{kind}
-    parts = custom_id.split("::")
-    data = {"kind": "", "file": "", "page": 0}
-    if len(parts) >= 4 and parts[0] == "extract":
-        data["file"] = parts[1]
-        # page like p2
-        p = parts[2]
-        if p and p[0].lower() == "p":
-            try:
-                data["page"] = int(p[1:])
-            except Exception:
-                data["page"] = 0
-        data["kind"] = parts[3]
-    return data
+    m = EXTRACT_ID_RE.match(custom_id)
+    if m is None:
+        return {"kind": "", "file": "", "page": 0}
+    return {"kind": m[3], "file": m[1], "page": int(m[2])}
 
 
 def parse_detection_pages(jsonl_paths: Sequence[os.PathLike[str] | str]) -> Dict[str, Dict[int, Dict[str, Any]]]:
@@ -57,107 +99,199 @@ def parse_detection_pages(jsonl_paths: Sequence[os.PathLike[str] | str]) -> Dict
         if not path.exists():
             print(f"Warning: detection results file not found: {path}")
             continue
-        with open(path, "r", encoding="utf-8") as f:
-            for line_number, line in enumerate(f, start=1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError as exc:
-                    print(f"Warning: could not parse detection JSONL line {line_number} in {path}: {exc}")
-                    continue
-                if obj.get("error"):
-                    continue
-                resp_wrapper = obj.get("response") or {}
-                body = resp_wrapper.get("body") or {}
-                parsed = extract_structured_output(body)
-                if not parsed or parsed.get("page_type") != "area_graphs":
-                    continue
-                cid = obj.get("custom_id", "")
-                parts = cid.split("::")
-                if len(parts) < 3 or parts[0] != "detect":
-                    continue
-                file_name = parts[1]
-                page_token = parts[2]
-                page_num = 0
-                if page_token.lower().startswith("p"):
-                    try:
-                        page_num = int(page_token[1:])
-                    except ValueError:
-                        page_num = 0
-                if page_num <= 0:
-                    continue
-                pages_by_file.setdefault(file_name, {})[page_num] = {
-                    "location": parsed.get("location") or "",
-                    "graphs": parsed.get("graphs") or [],
-                }
-    return pages_by_file
 
+        def warn(line_number: int, exc: ValueError) -> None:
+            print(f"Warning: could not parse detection JSONL line {line_number} in {path}: {exc}")
 
-def parse_jsonl_file(path: str, detection_locations: Optional[Dict[Tuple[str, int], str]] = None) -> List[Dict]:
-    rows: List[Dict] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
+        for _, obj in iter_jsonl(path, on_error=warn):
             if obj.get("error"):
                 continue
             resp_wrapper = obj.get("response") or {}
             body = resp_wrapper.get("body") or {}
             parsed = extract_structured_output(body)
-            if not parsed:
+            if not parsed or parsed.get("page_type") != "area_graphs":
                 continue
-            custom_id = obj.get("custom_id", "")
-            meta = parse_custom_id(custom_id)
-            file_name = meta.get("file") or ""
-            page_index = max(0, meta.get("page", 1) - 1)
-            detection_location = ""
-            if detection_locations:
-                detection_location = detection_locations.get((file_name, page_index + 1), "") or ""
-            # Treat placeholder/unknown locations as empty so we can fall back to detection.
-            location = normalize_location_string(parsed.get("location"))
-            if not location:
-                location = detection_location
-            kind = meta.get("kind") or ""
-            # Support both per-graph and combined outputs
-            if kind == "combined" and all(k in (parsed or {}) for k in ("wind", "precipitation", "temperature")):
-                for sub_kind in ("wind", "precipitation", "temperature"):
-                    sub_payload = parsed.get(sub_kind) or {}
-                    loc = normalize_location_string(
-                        location
-                        or sub_payload.get("location")
-                        or detection_location
-                        or parsed.get(sub_kind, {}).get("location")
-                        or ""
-                    )
-                    rows.extend(series_to_rows(file_name, page_index, loc, sub_kind, sub_payload))
+            cid = obj.get("custom_id", "")
+            m = _DETECT_ID_RE.match(cid)
+            if m is None:
                 continue
-            if kind not in ("wind", "precipitation", "temperature"):
+            file_name = m[1]
+            page_num = int(m[2])
+            if page_num <= 0:
                 continue
-            rows.extend(series_to_rows(file_name, page_index, location, kind, parsed))
+            pages_by_file.setdefault(file_name, {})[page_num] = {
+                "location": parsed.get("location") or "",
+                "graphs": parsed.get("graphs") or [],
+            }
+    return pages_by_file
+
+
+def _parse_range(
+    path: str, detection_locations: Optional[Dict[Tuple[str, int], str]], start: int = 0, end: Optional[int] = None
+) -> List[Dict]:
+    rows: List[Dict] = []
+    # Records arrive grouped by file and page, so remember the last detection lookup
+    last_key: Optional[Tuple[str, int]] = None
+    last_location = ""
+    for _, obj in iter_jsonl(path, start=start, end=end):
+        if obj.get("error"):
+            continue
+        resp_wrapper = obj.get("response") or {}
+        body = resp_wrapper.get("body") or {}
+        parsed = extract_structured_output(body)
+        if not parsed:
+            continue
+        custom_id = obj.get("custom_id", "")
+        meta = parse_custom_id(custom_id)
+        file_name = sys.intern(meta.get("file") or "")
+        page_index = max(0, meta.get("page", 1) - 1)
+        detection_location = ""
+        if detection_locations:
+            key = (file_name, page_index + 1)
+            if key != last_key:
+                last_key = key
+                last_location = detection_locations.get(key, "") or ""
+            detection_location = last_location
+        # Treat placeholder/unknown locations as empty so we can fall back to detection.
+        location = normalize_location_string(parsed.get("location"))
+        if not location:
+            location = detection_location
+        kind = meta.get("kind") or ""
+        # Support both per-graph and combined outputs
+        if kind == "combined" and all(k in (parsed or {}) for k in ("wind", "precipitation", "temperature")):
+            for sub_kind in ("wind", "precipitation", "temperature"):
+                sub_payload = parsed.get(sub_kind) or {}
+                loc = normalize_location_string(
+                    location
+                    or sub_payload.get("location")
+                    or detection_location
+                    or parsed.get(sub_kind, {}).get("location")
+                    or ""
+                )
+                rows.extend(series_to_rows(file_name, page_index, loc, sub_kind, sub_payload))
+            continue
+        if kind not in ("wind", "precipitation", "temperature"):
+            continue
+        rows.extend(series_to_rows(file_name, page_index, location, kind, parsed))
     return rows
 
 
-def _fill_missing_locations(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty or "Location" not in df.columns:
-        return df
-    # For each (SourceFile, Page), if Location is empty for some rows but present for others, fill with the most common non-empty string.
-    def fill_group(g: pd.DataFrame) -> pd.DataFrame:
-        non_empty = [s for s in g["Location"].astype(str).tolist() if s.strip()]
-        repl = None
-        if non_empty:
-            # Choose the most frequent
-            repl = pd.Series(non_empty).mode().iloc[0]
-        if repl:
-            g.loc[g["Location"].astype(str).str.strip() == "", "Location"] = repl
-        return g
-    return df.groupby(["SourceFile", "Page"], group_keys=False).apply(fill_group)
+def shard_offsets(path: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a file into up to `shards` byte ranges that each start and end on a line boundary."""
+    size = os.path.getsize(path)
+    if size == 0 or shards <= 1:
+        return [(0, size)]
+    cuts = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, shards):
+            nl = mm.find(b"\n", max(cuts[-1], i * size // shards))
+            if nl == -1:
+                break
+            if nl + 1 < size:
+                cuts.append(nl + 1)
+    cuts.append(size)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+_shard_detection_locations: Optional[Dict[Tuple[str, int], str]] = None
+
+
+def _init_shard_worker(detection_locations: Optional[Dict[Tuple[str, int], str]]) -> None:
+    global _shard_detection_locations
+    _shard_detection_locations = detection_locations
+
+
+def _parse_shard(args: Tuple[str, int, int]) -> List[Dict]:
+    path, start, end = args
+    return _parse_range(path, _shard_detection_locations, start, end)
+
+
+def parse_jsonl_files(
+    paths: Sequence[str], detection_locations: Optional[Dict[Tuple[str, int], str]] = None, workers: int = 1
+) -> Iterator[List[Dict]]:
+    """Rows for each Batch results file, in input order.
+
+    Once the files total SHARD_MIN_BYTES, files over that size are split into line-aligned shards and every
+    shard of every file goes to one pool of `workers` processes.
+    """
+    sizes = [os.path.getsize(path) for path in paths]
+    if workers <= 1 or sum(sizes) < SHARD_MIN_BYTES:
+        for path in paths:
+            yield _parse_range(path, detection_locations)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_shard_worker, initargs=(detection_locations,)
+    ) as pool:
+        file_futures = [
+            [
+                pool.submit(_parse_shard, (path, lo, hi))
+                for lo, hi in (shard_offsets(path, workers) if size >= SHARD_MIN_BYTES else [(0, size)])
+            ]
+            for path, size in zip(paths, sizes)
+        ]
+        for index, futures in enumerate(file_futures):
+            rows: List[Dict] = []
+            for fut in futures:
+                rows.extend(fut.result())
+            # Drop the finished futures so each file's rows are freed once the caller is done with them
+            file_futures[index] = []
+            yield rows
+
+
+def parse_jsonl_file(
+    path: str, detection_locations: Optional[Dict[Tuple[str, int], str]] = None, workers: int = 1
+) -> List[Dict]:
+    """Rows for one Batch results file; files over SHARD_MIN_BYTES are split across `workers` processes."""
+    return next(parse_jsonl_files([path], detection_locations, workers))
+
+
+def _most_common_location(counts: Counter) -> str:
+    # Most frequent wins; ties go to the lexically smallest, matching pandas Series.mode
+    return min(counts.items(), key=lambda kv: (-kv[1], kv[0]))[0]
+
+
+def write_rows_csv(row_batches: Iterable[List[Dict]], out_csv: str) -> int:
+    """Stream row batches to out_csv and return the row count.
+
+    Rows with an empty Location take the most common non-empty Location of their (SourceFile, Page); the
+    per-page tallies are gathered while writing, so only files that need a fill get a second pass.
+    """
+    location_counts: Dict[Tuple[str, str], Counter] = {}
+    needs_fill: Set[Tuple[str, str]] = set()
+    n_rows = 0
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(ROW_COLUMNS)
+        for rows in row_batches:
+            for row in rows:
+                key = (str(row.get("SourceFile")), str(row.get("Page")))
+                location = row.get("Location")
+                if str(location).strip():
+                    location_counts.setdefault(key, Counter())[location] += 1
+                else:
+                    needs_fill.add(key)
+                writer.writerow([row.get(c) for c in ROW_COLUMNS])
+            n_rows += len(rows)
+    fills = {key: _most_common_location(location_counts[key]) for key in needs_fill if key in location_counts}
+    if fills:
+        _rewrite_locations(out_csv, fills)
+    return n_rows
+
+
+def _rewrite_locations(path: str, fills: Dict[Tuple[str, str], str]) -> None:
+    loc_idx = ROW_COLUMNS.index("Location")
+    tmp = f"{path}.tmp"
+    with open(path, "r", newline="", encoding="utf-8") as src, open(tmp, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst, lineterminator="\n")
+        writer.writerow(next(reader))
+        for record in reader:
+            if not record[loc_idx].strip():
+                fill = fills.get((record[0], record[1]))
+                if fill:
+                    record[loc_idx] = fill
+            writer.writerow(record)
+    os.replace(tmp, path)
 
 
 def main():
@@ -169,9 +303,14 @@ def main():
         nargs="*",
         help="Optional detection results JSONL files for location fallback",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Processes parsing the results files, sharding large ones (default: CPU count; 1 parses in-process)",
+    )
     args = parser.parse_args()
 
-    all_rows: List[Dict] = []
     detection_locations: Optional[Dict[Tuple[str, int], str]] = None
     if args.detect_results:
         detection_map = parse_detection_pages(args.detect_results)
@@ -182,20 +321,21 @@ def main():
             if page_data.get("location")
         } or None
 
+    paths = []
     for path in args.input_jsonl:
         if not os.path.exists(path):
             print(f"Warning: missing {path}")
             continue
-        rows = parse_jsonl_file(path, detection_locations=detection_locations)
-        all_rows.extend(rows)
+        paths.append(path)
+    workers = args.workers or os.cpu_count() or 1
 
     out_dir = os.path.dirname(args.out_csv)
     if out_dir:
         os.makedirs(out_dir, exist_ok=True)
-    df = pd.DataFrame(all_rows)
-    df = _fill_missing_locations(df)
-    df.to_csv(args.out_csv, index=False)
-    print(f"Wrote {len(all_rows)} rows to {args.out_csv}")
+    # One process pool parses every file's shards, so files overlap without nesting a pool per file
+    row_batches = parse_jsonl_files(paths, detection_locations=detection_locations, workers=workers)
+    n_rows = write_rows_csv(row_batches, args.out_csv)
+    print(f"Wrote {n_rows} rows to {args.out_csv}")
 
 
 if __name__ == "__main__":
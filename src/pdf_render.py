@@ -1,27 +1,142 @@
-from typing import List, Optional
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import fitz  # PyMuPDF
 from PIL import Image
-from .metrics import log_event, time_block
+from .metrics import captured_events, log_event, time_block, write_events
 
 
-def render_pdf_to_images(path: str, dpi: int = 350, metrics_path: Optional[str] = None) -> List[Image.Image]:
-    """Render all pages of a PDF to PIL Images at the given DPI."""
-    images: List[Image.Image] = []
+def pdf_page_count(path: str) -> int:
+    doc = fitz.open(path)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def iter_pdf_pages(
+    path: str,
+    dpi: int = 350,
+    pages: Optional[Iterable[int]] = None,
+    metrics_path: Optional[str] = None,
+    doc: Optional[fitz.Document] = None,
+) -> Iterator[Tuple[int, Image.Image]]:
+    """Lazily render (1-based page number, image) pairs, optionally only for the given page numbers.
+
+    Pass an already open `doc` for `path` to skip reopening it; the caller keeps ownership and closes it.
+    """
+    rendered = 0
+    owns_doc = doc is None
     with time_block("render_pdf", metrics_path, file=path, dpi=dpi):
-        doc = fitz.open(path)
+        if owns_doc:
+            doc = fitz.open(path)
         try:
-            for idx, page in enumerate(doc, start=1):
-                with time_block("render_page", metrics_path, file=path, dpi=dpi, page=idx):
-                    zoom = dpi / 72.0
-                    mat = fitz.Matrix(zoom, zoom)
+            wanted = range(1, doc.page_count + 1) if pages is None else sorted(set(pages))
+            zoom = dpi / 72.0
+            mat = fitz.Matrix(zoom, zoom)
+            for idx in wanted:
+                if not (1 <= idx <= doc.page_count):
+                    continue
+                # Skip the per-page timer entirely when metrics are off
+                timer = (
+                    time_block("render_page", metrics_path, file=path, dpi=dpi, page=idx)
+                    if metrics_path is not None
+                    else nullcontext()
+                )
+                with timer:
+                    page = doc.load_page(idx - 1)
                     pix = page.get_pixmap(matrix=mat, alpha=False)
-                    mode = "RGB" if pix.alpha == 0 else "RGBA"
-                    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-                    if img.mode != "RGB":
-                        img = img.convert("RGB")
-                    images.append(img)
+                    # alpha=False always yields RGB; decode straight from the pixmap's buffer (samples_mv) rather
+                    # than the bytes copy that pix.samples makes, leaving PIL's own copy as the only one
+                    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+                rendered += 1
+                yield idx, img
         finally:
-            doc.close()
-    log_event(metrics_path, {"type": "render_summary", "file": path, "pages": len(images), "dpi": dpi})
-    return images
+            if owns_doc:
+                doc.close()
+    log_event(metrics_path, {"type": "render_summary", "file": path, "pages": rendered, "dpi": dpi})
+
+
+def _render_cache_dir(path: str, dpi: int, cache_dir: str) -> str:
+    st = os.stat(path)
+    key = hashlib.blake2b(f"{os.path.realpath(path)}:{st.st_mtime_ns}:{dpi}".encode(), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, key)
+
+
+def iter_cached_pdf_pages(
+    path: str,
+    dpi: int = 350,
+    pages: Optional[Iterable[int]] = None,
+    cache_dir: Optional[str] = None,
+    metrics_path: Optional[str] = None,
+    doc: Optional[fitz.Document] = None,
+) -> Iterator[Tuple[int, Image.Image]]:
+    """iter_pdf_pages backed by a PNG per page under cache_dir, keyed by (path, mtime, dpi).
+
+    Pages already on disk are loaded instead of re-rendered, so repeated passes over the same PDFs only pay for I/O.
+    """
+    if cache_dir is None:
+        yield from iter_pdf_pages(path, dpi=dpi, pages=pages, metrics_path=metrics_path, doc=doc)
+        return
+    page_dir = _render_cache_dir(path, dpi, cache_dir)
+    os.makedirs(page_dir, exist_ok=True)
+    total = doc.page_count if doc is not None else pdf_page_count(path)
+    wanted = [p for p in (range(1, total + 1) if pages is None else sorted(set(pages))) if 1 <= p <= total]
+    missing = [p for p in wanted if not os.path.exists(os.path.join(page_dir, f"p{p}.png"))]
+    # Both lists are sorted, so freshly rendered pages come back in the order they are needed
+    rendered = iter_pdf_pages(path, dpi=dpi, pages=missing, metrics_path=metrics_path, doc=doc) if missing else iter(())
+    missing_set = set(missing)
+    for idx in wanted:
+        png_path = os.path.join(page_dir, f"p{idx}.png")
+        if idx in missing_set:
+            _, img = next(rendered)
+            tmp = f"{png_path}.{os.getpid()}.tmp"
+            img.save(tmp, format="PNG", compress_level=1)
+            os.replace(tmp, png_path)
+        else:
+            img = Image.open(png_path)
+            img.load()
+        yield idx, img
+
+
+def _render_page_range(
+    path: str, dpi: int, pages: List[int], metrics_path: Optional[str]
+) -> Tuple[List[Image.Image], List[Tuple[str, Dict]]]:
+    # Metrics come back with the images so only the parent process appends to the metrics file
+    with captured_events() as events:
+        images = [img for _, img in iter_pdf_pages(path, dpi=dpi, pages=pages, metrics_path=metrics_path)]
+    return images, events
+
+
+def render_pdf_to_images(
+    path: str,
+    dpi: int = 350,
+    metrics_path: Optional[str] = None,
+    workers: int = 1,
+    pages: Optional[Iterable[int]] = None,
+) -> List[Image.Image]:
+    """Render the pages of a PDF (all, or only the given 1-based page numbers, in order) to PIL Images.
+
+    With workers > 1, pages are split into contiguous ranges rendered by up to that many processes.
+    PyMuPDF is not thread-safe, so each worker opens its own copy of the document.
+    """
+    n_pages = pdf_page_count(path)
+    wanted = list(range(1, n_pages + 1)) if pages is None else sorted({p for p in pages if 1 <= p <= n_pages})
+    if not wanted:
+        return []
+    workers = min(max(1, workers), len(wanted))
+    if workers <= 1:
+        return [img for _, img in iter_pdf_pages(path, dpi=dpi, pages=wanted, metrics_path=metrics_path)]
+    bounds = [i * len(wanted) // workers for i in range(workers + 1)]
+    ranges = [wanted[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_page_range, path, dpi, chunk, metrics_path) for chunk in ranges]
+        images: List[Image.Image] = []
+        for fut in futures:
+            chunk_images, events = fut.result()
+            write_events(events)
+            images.extend(chunk_images)
+        return images
@@ -1,9 +1,12 @@
 import argparse
 import csv
 import json
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Tuple, Any, List
 
+import pandas as pd
+
 from .aggregation import (
     aggregate_runs,
     harmonize_locations,
@@ -22,58 +25,41 @@ def parse_tolerance_overrides(values: List[str]) -> Dict[Tuple[str, str], float]
     return overrides
 
 
-def load_run_csv(path: Path) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    numeric_groups: Dict[Tuple[str, str, str, str, str], List[float]] = {}
-    for row in rows:
-        group_key = (
-            row.get("SourceFile"),
-            row.get("Page"),
-            row.get("Section"),
-            row.get("Measurement"),
-            row.get("MeasurementType"),
-        )
-        value_numeric = row.get("ValueNumeric")
-        if value_numeric not in ("", None):
-            try:
-                numeric_groups.setdefault(group_key, []).append(float(value_numeric))
-            except ValueError:
-                continue
-
-    drop_groups: set[Tuple[str, str, str, str, str]] = set()
-    for key, values in numeric_groups.items():
-        if values and all(abs(v) < 1e-9 for v in values):
-            drop_groups.add(key)
+GROUP_COLUMNS = ["SourceFile", "Page", "Section", "Measurement", "MeasurementType"]
+
 
+def load_run_frame(path: Path) -> pd.DataFrame:
+    """Run CSV as string columns, without the groups whose numeric values are all zero."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    numeric = pd.to_numeric(df["ValueNumeric"], errors="coerce")
+    flags = pd.DataFrame({"has_numeric": numeric.notna(), "nonzero": numeric.abs() >= 1e-9})
+    grouped = flags.groupby([df[c] for c in GROUP_COLUMNS], sort=False, dropna=False)
+    drop = grouped["has_numeric"].transform("any") & ~grouped["nonzero"].transform("any")
+    return df[~drop]
+
+
+def load_run_csv(path: Path) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+    df = load_run_frame(path)
+    # Key and value columns are converted in bulk rather than with int()/float() per row.
+    # astype(float) round-trips exactly; to_numeric only marks which cells are numbers.
+    pages = df["Page"].astype("int64").tolist()
+    hours = df["HourIndex"].astype("int64").tolist()
+    raw_numeric = df["ValueNumeric"]
+    is_number = pd.to_numeric(raw_numeric, errors="coerce").notna()
+    numeric_values = raw_numeric.where(~is_number, "").astype(object)
+    numeric_values[is_number] = raw_numeric[is_number].astype("float64")
     row_map: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
-    for row in rows:
-        group_key = (
-            row.get("SourceFile"),
-            row.get("Page"),
-            row.get("Section"),
-            row.get("Measurement"),
-            row.get("MeasurementType"),
-        )
-        if group_key in drop_groups:
-            continue
+    # Only rows that survive the zero-group filter are materialised as dicts
+    for row, page, hour, numeric_value in zip(df.to_dict(orient="records"), pages, hours, numeric_values.tolist()):
         key = (
             row.get("SourceFile"),
-            int(row.get("Page")),
+            page,
             row.get("Section"),
             row.get("Measurement"),
             row.get("MeasurementType"),
-            int(row.get("HourIndex")),
+            hour,
             row.get("HourLabel"),
         )
-        value_numeric = row.get("ValueNumeric")
-        if value_numeric in ("", None):
-            numeric_value: Any = ""
-        else:
-            try:
-                numeric_value = float(value_numeric)
-            except ValueError:
-                numeric_value = value_numeric
         location = normalize_location_string(row.get("Location"))
         value_text = normalize_text_value(row.get("Section"), row.get("MeasurementType"), row.get("ValueText"))
         row_map[key] = {
@@ -128,7 +114,6 @@ def main() -> None:
     )
     harmonize_locations(final_rows_map)
 
-    final_rows = list(final_rows_map.values())
     fieldnames = [
         "SourceFile",
         "Page",
@@ -149,19 +134,13 @@ def main() -> None:
     out_csv_path = Path(args.out_csv)
     out_csv_path.parent.mkdir(parents=True, exist_ok=True)
     with open(out_csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in sorted(
-            final_rows,
-            key=lambda r: (
-                r.get("SourceFile"),
-                int(r.get("Page", 0)),
-                r.get("Section"),
-                int(r.get("HourIndex", 0)),
-                r.get("MeasurementType"),
-            ),
-        ):
-            writer.writerow(row)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        # Row keys already carry Page and HourIndex as ints, so sort on them rather than re-parsing every row:
+        # (SourceFile, Page, Section, HourIndex, MeasurementType)
+        for key in sorted(final_rows_map, key=itemgetter(0, 1, 2, 5, 4)):
+            # Missing fields become None, which csv writes as "" just like DictWriter's restval
+            writer.writerow(tuple(map(final_rows_map[key].get, fieldnames)))
 
     report = {
         "run_count": len(run_maps),
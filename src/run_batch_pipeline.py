@@ -1,17 +1,20 @@
 import argparse
-import json
-import math
+import csv
+import multiprocessing
 import os
+import random
+import shutil
 import time
 from dataclasses import dataclass
 from pathlib import Path
-import copy
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
 from typing import Dict, Iterable, List, Sequence, Any, Optional, Tuple, Set
 import re
 import subprocess
 
-from PIL import Image
 import fitz
 
 try:
@@ -31,13 +34,16 @@ from .batch_builder import (
     build_extract_wind_request,
     write_jsonl,
 )
+from .extractors import ROW_COLUMNS
 from .parse_batch_results import (
-    parse_custom_id,
+    EXTRACT_ID_RE,
+    iter_jsonl,
     parse_detection_pages,
     parse_jsonl_file,
     extract_structured_output,
 )
-from .pdf_render import render_pdf_to_images
+from .jsonio import dumps as _dumps, dumps_indented
+from .pdf_render import iter_cached_pdf_pages, pdf_page_count
 from .utils import crop_normalized_box
 from .aggregation import (
     DEFAULT_NUMERIC_TOLERANCES,
@@ -51,6 +57,16 @@ from .aggregation import (
 
 
 DEFAULT_KINDS = ("wind", "precipitation", "temperature")
+_ALL_KINDS = frozenset(DEFAULT_KINDS)
+# Per-kind extraction request builders, in DEFAULT_KINDS order
+_KIND_REQUEST_BUILDERS = (
+    ("wind", build_extract_wind_request),
+    ("precipitation", build_extract_precip_request),
+    ("temperature", build_extract_temperature_request),
+)
+_get_reason = itemgetter("reason")
+_get_graph = itemgetter("graph")
+_get_row_values = itemgetter(*ROW_COLUMNS)
 SECTION_KIND_MAP = {
     "Wind": "wind",
     "Precip": "precipitation",
@@ -83,19 +99,17 @@ KIND_REPROMPT_RULES = {
 }
 
 
+_PAGE9_DATE_RE = re.compile(r"1800 on (.+?) until")
+# One table row per line: site name, snow total, rain total. [^\S\n] is whitespace that stays on the line.
+_PAGE9_ROW_RE = re.compile(
+    r"^[^\S\n]*([A-Za-z' ]{3,})[^\S\n]+([0-9]+\.?[0-9]*)[^\S\n]+([0-9]+\.?[0-9]*)[^\S\n]*$", re.MULTILINE
+)
+
+
 def extract_page9_rows(pdf_path: Path) -> List[Dict[str, Any]]:
     """Parse page 9 table for cumulative rain/snow and forecast start date."""
     rows: List[Dict[str, Any]] = []
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception:
-        return rows
-    try:
-        if doc.page_count < 9:
-            return rows
-    finally:
-        doc.close()
-
+    # PDFs without a page 9 make pdftotext fail or print nothing, so no separate page-count check is needed
     try:
         result = subprocess.run(
             ["pdftotext", "-layout", "-f", "9", "-l", "9", str(pdf_path), "-"],
@@ -106,13 +120,12 @@ def extract_page9_rows(pdf_path: Path) -> List[Dict[str, Any]]:
     except Exception:
         return rows
 
-    text = result.stdout.splitlines()
+    # Normalise every line break splitlines() recognises (pdftotext ends pages with \f) so ^/$ see each line
+    text = "\n".join(result.stdout.splitlines())
     date_str = ""
-    for line in text:
-        m = re.search(r"1800 on (.+?) until", line)
-        if m:
-            date_str = m.group(1).strip()
-            break
+    m = _PAGE9_DATE_RE.search(text)
+    if m:
+        date_str = m.group(1).strip()
     if date_str:
         rows.append(
             {
@@ -133,11 +146,7 @@ def extract_page9_rows(pdf_path: Path) -> List[Dict[str, Any]]:
             }
         )
 
-    row_re = re.compile(r"\s*([A-Za-z' ]{3,})\s+([0-9]+\.?[0-9]*)\s+([0-9]+\.?[0-9]*)\s*$")
-    for line in text:
-        m = row_re.match(line)
-        if not m:
-            continue
+    for m in _PAGE9_ROW_RE.finditer(text):
         site = m.group(1).strip()
         snow_val = float(m.group(2))
         rain_val = float(m.group(3))
@@ -183,17 +192,38 @@ class BatchPaths:
     extract_results: Path
     out_csv: Path
     disagreement_report: Optional[Path] = None
+
+
+def _scan_pdfs(root: Path, skip_dir: Path) -> List[Path]:
+    """Resolved *.pdf files under root, in rglob-sorted order, never descending into skip_dir or symlinked directories.
+
+    Walking from the real root through real directories keeps every path canonical, so only symlinked files
+    need a realpath call.
+    """
+    base = os.path.realpath(root)
+    rel_root = os.path.normpath(root)
+    skip = os.path.realpath(skip_dir)
+    found: List[Tuple[Path, str]] = []
+    stack = [base]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path != skip:
+                    stack.append(entry.path)
+            elif entry.name.endswith(".pdf") and entry.is_file():
+                real = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                # Order by the path as spelled under root, as sorting the rglob results did
+                found.append((Path(rel_root, entry.path[len(base) :].lstrip(os.sep)), real))
+    found.sort()
+    return [Path(real) for _, real in found]
+
+
 def discover_pdfs(explicit: Sequence[str] | None, input_dir: Path) -> List[Path]:
     """Return the list of PDFs to process, preferring explicit arguments over directory scanning."""
-    if explicit:
-        pdfs = [Path(p).expanduser() for p in explicit]
-    else:
-        search_dir = input_dir if input_dir else Path(".")
-        candidates = sorted(search_dir.rglob("*.pdf"))
-        # If the target directory is empty, fall back to PDFs in CWD for convenience
-        if not candidates and search_dir != Path("."):
-            candidates = sorted(Path(".").glob("*.pdf"))
-        pdfs = candidates
     disabled_dir = (input_dir / "disabled").resolve()
 
     def is_disabled(path: Path) -> bool:
@@ -203,8 +233,19 @@ def discover_pdfs(explicit: Sequence[str] | None, input_dir: Path) -> List[Path]
         except ValueError:
             return False
 
-    pdfs = [p for p in pdfs if not is_disabled(p)]
-    pdfs = [p for p in pdfs if p.suffix.lower() == ".pdf" and p.is_file()]
+    pdfs: List[Path] = []
+    if explicit:
+        candidates = [Path(p).expanduser() for p in explicit]
+        candidates = [p for p in candidates if not is_disabled(p)]
+    else:
+        search_dir = input_dir if input_dir else Path(".")
+        # The scan prunes disabled/ itself and yields resolved paths, so only the CWD fallback needs checks
+        pdfs = _scan_pdfs(search_dir, input_dir / "disabled")
+        candidates = []
+        # If the target directory is empty, fall back to PDFs in CWD for convenience
+        if not pdfs and search_dir != Path("."):
+            candidates = [p for p in sorted(Path(".").glob("*.pdf")) if not is_disabled(p)]
+    pdfs += [p.resolve() for p in candidates if p.suffix.lower() == ".pdf" and p.is_file()]
     if not pdfs:
         target = input_dir if not explicit else Path(".")
         raise SystemExit(
@@ -214,8 +255,7 @@ def discover_pdfs(explicit: Sequence[str] | None, input_dir: Path) -> List[Path]
     resolved: List[Path] = []
     seen_paths: set[Path] = set()
     seen_names: Dict[str, Path] = {}
-    for pdf in pdfs:
-        abs_pdf = pdf.resolve()
+    for abs_pdf in pdfs:
         if abs_pdf in seen_paths:
             continue
         seen_paths.add(abs_pdf)
@@ -234,59 +274,99 @@ def build_pdf_lookup(pdfs: Sequence[Path]) -> Dict[str, Path]:
     return lookup
 
 
-def build_detection_jsonl(model: str, pdfs: Sequence[Path], out_jsonl: Path, dpi: int, max_page_px: int) -> Path:
+def _pool_workers(workers: Optional[int], jobs: int) -> int:
+    return max(1, min(workers or os.cpu_count() or 1, jobs))
+
+
+def _spawn_pool(n_workers: int) -> ProcessPoolExecutor:
+    # These pools start while or after upload and shard threads run; forking then could copy a lock another thread holds
+    # (stdout, metrics, HTTP client), so workers start from a fresh interpreter instead
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _detection_items_for_pdf(
+    model: str, pdf: Path, dpi: int, max_page_px: int, render_cache_dir: Optional[Path] = None
+) -> List[Dict]:
     items: List[Dict] = []
-    for pdf in pdfs:
-        pages = render_pdf_to_images(str(pdf), dpi=dpi)
-        total = len(pages)
-        for page_index, img in enumerate(pages, start=1):
-            if total > 2 and page_index in (1, total):
-                continue
+    cache_dir = str(render_cache_dir) if render_cache_dir else None
+    # One open document serves the page count and every page render
+    with fitz.open(str(pdf)) as doc:
+        total = doc.page_count
+        # Cover and back pages are never graph pages, so they are not rendered at all
+        wanted = range(2, total) if total > 2 else range(1, total + 1)
+        for page_index, img in iter_cached_pdf_pages(str(pdf), dpi=dpi, pages=wanted, cache_dir=cache_dir, doc=doc):
             req = build_detect_regions_request(model, img, max_side=max_page_px)
             req["custom_id"] = f"detect::{pdf.name}::p{page_index}"
             items.append(req)
+    return items
+
+
+def build_detection_jsonl(
+    model: str,
+    pdfs: Sequence[Path],
+    out_jsonl: Path,
+    dpi: int,
+    max_page_px: int,
+    workers: Optional[int] = None,
+    render_cache_dir: Optional[Path] = None,
+) -> Path:
+    """Render and encode each PDF's pages in a worker process (default: one per CPU); requests keep PDF order.
+
+    With render_cache_dir, rendered pages are kept on disk and reused by later builds of the same PDFs.
+    """
+    items: List[Dict] = []
+    n_workers = _pool_workers(workers, len(pdfs))
+    if n_workers == 1:
+        for pdf in pdfs:
+            items.extend(_detection_items_for_pdf(model, pdf, dpi, max_page_px, render_cache_dir))
+    else:
+        # Workers send back finished requests (base64 JPEGs), which pickle far smaller than rendered pages
+        with _spawn_pool(n_workers) as pool:
+            build_one = partial(
+                _detection_items_for_pdf, model, dpi=dpi, max_page_px=max_page_px, render_cache_dir=render_cache_dir
+            )
+            for pdf_items in pool.map(build_one, pdfs):
+                items.extend(pdf_items)
     write_jsonl(items, str(out_jsonl))
     print(f"Wrote {len(items)} detection batch items -> {out_jsonl}")
     return out_jsonl
 
 
-def build_extraction_jsonl_from_detect(
+def build_tagged_request(job: Tuple[Any, str]) -> Dict:
+    build, custom_id = job
+    req = build()
+    req["custom_id"] = custom_id
+    return req
+
+
+def _extraction_items_for_pdf(
     model: str,
-    detection_map: Dict[str, Dict[int, Dict[str, object]]],
-    pdf_lookup: Dict[str, Path],
-    out_jsonl: Path,
+    file_name: str,
+    pdf_path: Path,
+    pages: Dict[int, Dict[str, object]],
     dpi: int,
     max_crop_px: int,
-    kinds: Iterable[str],
-    *,
-    only_graphs: Optional[Iterable[Tuple[str, int, str]]] = None,
-    prompt_overrides: Optional[Dict[Tuple[str, int, str], str]] = None,
-    prefer_combined: bool = True,
-) -> Path:
-    kind_set = {k for k in kinds if k}
-    if not kind_set:
-        raise SystemExit("At least one graph kind must be specified for extraction.")
-    items: List[Dict] = []
-    rendered_cache: Dict[str, List[Image.Image]] = {}
-    allowed_graphs: Optional[Set[Tuple[str, int, str]]] = None
-    if only_graphs:
-        allowed_graphs = {tuple(g) for g in only_graphs}
-    override_map = prompt_overrides or {}
-    for file_name, pages in detection_map.items():
-        pdf_path = pdf_lookup.get(file_name)
-        if not pdf_path:
-            print(f"Warning: detection results reference {file_name}, but no matching PDF was provided.")
-            continue
-        images = rendered_cache.get(file_name)
-        if images is None:
-            images = render_pdf_to_images(str(pdf_path), dpi=dpi)
-            rendered_cache[file_name] = images
-        total_pages = len(images)
-        for page_num, page_data in sorted(pages.items()):
+    kind_set: Set[str],
+    allowed_graphs: Optional[Set[Tuple[str, int, str]]],
+    override_map: Dict[Tuple[str, int, str], str],
+    prefer_combined: bool,
+    render_cache_dir: Optional[Path] = None,
+    encode_workers: int = 1,
+) -> List[Dict]:
+    # (request builder, custom_id) per item; crops are resized and JPEG-encoded after the pages are cropped
+    pending: List[Tuple[Any, str]] = []
+    # One open document serves the page-range check and every page render
+    with fitz.open(str(pdf_path)) as doc:
+        total_pages = doc.page_count
+        for page_num in sorted(pages):
             if not (1 <= page_num <= total_pages):
                 print(f"Warning: skipping page {page_num} for {file_name}; out of range.")
-                continue
-            page_img = images[page_num - 1]
+        cache_dir = str(render_cache_dir) if render_cache_dir else None
+        # Only pages with detections are rendered
+        for page_num, page_img in iter_cached_pdf_pages(
+            str(pdf_path), dpi=dpi, pages=pages.keys(), cache_dir=cache_dir, doc=doc
+        ):
+            page_data = pages[page_num]
             crops_by_kind: Dict[str, any] = {}
             graphs = page_data.get("graphs") or []
             for graph in graphs:
@@ -295,11 +375,14 @@ def build_extraction_jsonl_from_detect(
                 if kind not in kind_set or not bbox:
                     continue
                 try:
-                    crop = crop_normalized_box(page_img, tuple(bbox))
+                    # Cropped and shrunk in one pass; the request builders then skip their resize,
+                    # and cache keys hash fewer pixels
+                    crops_by_kind[kind] = crop_normalized_box(page_img, bbox, max_crop_px)
                 except Exception as exc:
                     print(f"Warning: failed to crop {kind} on {file_name} page {page_num}: {exc}")
                     continue
-                crops_by_kind[kind] = crop
+            # Drop the full page now, so it is freed before the generator renders the next one
+            del page_img
             if not crops_by_kind:
                 continue
             selected_crops = {
@@ -309,80 +392,130 @@ def build_extraction_jsonl_from_detect(
             }
             if not selected_crops:
                 continue
-            have_all_requested = (
+            # Override prompts for DEFAULT_KINDS, looked up once and reused for every branch below
+            prompts = [override_map.get((file_name, page_num, k)) for k in DEFAULT_KINDS]
+            if (
                 prefer_combined
-                and {"wind", "precipitation", "temperature"}.issubset(kind_set)
-                and {"wind", "precipitation", "temperature"}.issubset(selected_crops.keys())
-            )
-            has_override = any(
-                override_map.get((file_name, page_num, ck)) for ck in ("wind", "precipitation", "temperature")
-            )
-            if have_all_requested and not has_override:
-                req = build_extract_all_request(model, selected_crops, max_side=max_crop_px)
-                req["custom_id"] = f"extract::{file_name}::p{page_num}::combined"
-                items.append(req)
+                and _ALL_KINDS.issubset(kind_set)
+                and _ALL_KINDS.issubset(selected_crops)
+                and not any(prompts)
+            ):
+                build = partial(build_extract_all_request, model, selected_crops, max_side=max_crop_px)
+                pending.append((build, f"extract::{file_name}::p{page_num}::combined"))
                 continue
-            if "wind" in selected_crops and "wind" in kind_set:
-                wind_prompt = override_map.get((file_name, page_num, "wind"))
-                req = build_extract_wind_request(
-                    model,
-                    selected_crops["wind"],
-                    prompt=wind_prompt,
-                    max_side=max_crop_px,
-                )
-                req["custom_id"] = f"extract::{file_name}::p{page_num}::wind"
-                items.append(req)
-            if "precipitation" in selected_crops and "precipitation" in kind_set:
-                precip_prompt = override_map.get((file_name, page_num, "precipitation"))
-                req = build_extract_precip_request(
-                    model,
-                    selected_crops["precipitation"],
-                    prompt=precip_prompt,
-                    max_side=max_crop_px,
-                )
-                req["custom_id"] = f"extract::{file_name}::p{page_num}::precipitation"
-                items.append(req)
-            if "temperature" in selected_crops and "temperature" in kind_set:
-                temp_prompt = override_map.get((file_name, page_num, "temperature"))
-                req = build_extract_temperature_request(
-                    model,
-                    selected_crops["temperature"],
-                    prompt=temp_prompt,
-                    max_side=max_crop_px,
-                )
-                req["custom_id"] = f"extract::{file_name}::p{page_num}::temperature"
-                items.append(req)
+            # selected_crops only holds kinds from kind_set, so membership there is the only check needed
+            for (kind, build_request), prompt in zip(_KIND_REQUEST_BUILDERS, prompts):
+                crop = selected_crops.get(kind)
+                if crop is None:
+                    continue
+                build = partial(build_request, model, crop, prompt=prompt, max_side=max_crop_px)
+                pending.append((build, f"extract::{file_name}::p{page_num}::{kind}"))
+    # PIL releases the GIL while resizing and encoding, so spare cores can encode crops side by side
+    if encode_workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(encode_workers, len(pending))) as pool:
+            return list(pool.map(build_tagged_request, pending))
+    return [build_tagged_request(job) for job in pending]
+
+
+def build_extraction_jsonl_from_detect(
+    model: str,
+    detection_map: Dict[str, Dict[int, Dict[str, object]]],
+    pdf_lookup: Dict[str, Path],
+    out_jsonl: Path,
+    dpi: int,
+    max_crop_px: int,
+    kinds: Iterable[str],
+    *,
+    only_graphs: Optional[Iterable[Tuple[str, int, str]]] = None,
+    prompt_overrides: Optional[Dict[Tuple[str, int, str], str]] = None,
+    prefer_combined: bool = True,
+    workers: Optional[int] = None,
+    render_cache_dir: Optional[Path] = None,
+) -> Path:
+    """Crop and encode each detected PDF in a worker process (default: one per CPU); requests keep detection order.
+
+    With render_cache_dir, rendered pages are kept on disk and reused by later builds of the same PDFs.
+    """
+    kind_set = {k for k in kinds if k}
+    if not kind_set:
+        raise SystemExit("At least one graph kind must be specified for extraction.")
+    allowed_graphs: Optional[Set[Tuple[str, int, str]]] = None
+    if only_graphs:
+        allowed_graphs = {tuple(g) for g in only_graphs}
+    override_map = prompt_overrides or {}
+    jobs = []
+    for file_name, pages in detection_map.items():
+        pdf_path = pdf_lookup.get(file_name)
+        if not pdf_path:
+            print(f"Warning: detection results reference {file_name}, but no matching PDF was provided.")
+            continue
+        jobs.append((file_name, pdf_path, pages))
+    n_workers = _pool_workers(workers, len(jobs))
+    build_one = partial(
+        _extraction_items_for_pdf,
+        dpi=dpi,
+        max_crop_px=max_crop_px,
+        kind_set=kind_set,
+        allowed_graphs=allowed_graphs,
+        override_map=override_map,
+        prefer_combined=prefer_combined,
+        render_cache_dir=render_cache_dir,
+        # CPUs of the worker budget left over by the per-PDF pool go to encoding crops within each PDF
+        encode_workers=max(1, (workers or os.cpu_count() or 1) // n_workers),
+    )
+    items: List[Dict] = []
+    if n_workers == 1:
+        for file_name, pdf_path, pages in jobs:
+            items.extend(build_one(model, file_name, pdf_path, pages))
+    else:
+        with _spawn_pool(n_workers) as pool:
+            futures = [pool.submit(build_one, model, file_name, pdf_path, pages) for file_name, pdf_path, pages in jobs]
+            for fut in futures:
+                items.extend(fut.result())
     write_jsonl(items, str(out_jsonl))
     print(f"Wrote {len(items)} extraction batch items -> {out_jsonl}")
     return out_jsonl
 
 
+def _wind_all_zero(hours: List[Dict[str, Any]]) -> bool:
+    return all((h.get("wind_speed_mph") or 0) == 0 and (h.get("wind_gust_mph") or 0) == 0 for h in hours)
+
+
+def _precip_all_zero(hours: List[Dict[str, Any]]) -> bool:
+    return all((h.get("rain_mm") or 0) == 0 and (h.get("snow_cm") or 0) == 0 for h in hours)
+
+
+def _temperature_all_zero(hours: List[Dict[str, Any]]) -> bool:
+    return all(
+        (h.get("air_temp_c") or 0) == 0
+        and (h.get("freezing_level_m") or 0) == 0
+        and (h.get("wet_bulb_freezing_level_m") or 0) == 0
+        for h in hours
+    )
+
+
+# Per-kind blank-series checks, each reading its fields directly; unknown kinds are never treated as blank
+_ALL_ZERO_CHECKS = {
+    "wind": _wind_all_zero,
+    "precipitation": _precip_all_zero,
+    "temperature": _temperature_all_zero,
+}
+
+
 def _series_all_zero(kind: str, payload: Dict[str, Any]) -> bool:
     hours = payload.get("hours") or []
     if not hours:
         return True
-    if kind == "wind":
-        return all(
-            (h.get("wind_speed_mph") or 0) == 0 and (h.get("wind_gust_mph") or 0) == 0
-            for h in hours
-        )
-    if kind == "precipitation":
-        return all(
-            (h.get("rain_mm") or 0) == 0 and (h.get("snow_cm") or 0) == 0
-            for h in hours
-        )
-    if kind == "temperature":
-        return all(
-            (h.get("air_temp_c") or 0) == 0
-            and (h.get("freezing_level_m") or 0) == 0
-            and (h.get("wet_bulb_freezing_level_m") or 0) == 0
-            for h in hours
-        )
-    return False
+    check = _ALL_ZERO_CHECKS.get(kind)
+    return check(hours) if check is not None else False
 
 
 def _normalize_series(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    data = copy.deepcopy(payload)
+    """Normalise location and precip types in place and return the same payload.
+
+    Payloads are freshly parsed per result line and owned by the caller; copy first if the original is needed.
+    """
+    data = payload
     data["location"] = normalize_location_string(data.get("location"))
     hours = data.get("hours") or []
     if kind == "precipitation":
@@ -406,113 +539,130 @@ def load_structured_results(jsonl_path: Path) -> Tuple[Dict[str, Dict[int, Dict[
     invalid_entries: List[Dict[str, Any]] = []
     if not Path(jsonl_path).exists():
         return results, invalid_entries
-    with open(jsonl_path, "r", encoding="utf-8") as f:
-        for line_number, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if obj.get("error"):
-                continue
-            resp_wrapper = obj.get("response") or {}
-            body = resp_wrapper.get("body") or {}
-            parsed = extract_structured_output(body)
-            if not parsed:
-                continue
-            meta = parse_custom_id(obj.get("custom_id", ""))
-            file_name = meta.get("file") or ""
-            page_num = meta.get("page") or 0
-            kind = meta.get("kind") or ""
-            if not file_name or page_num <= 0:
-                continue
-            if kind == "combined":
-                for sub_kind in ("wind", "precipitation", "temperature"):
-                    sub_payload = parsed.get(sub_kind)
-                    if sub_payload:
-                        ok, normalized_payload, reason = _validate_series(sub_kind, sub_payload)
-                        if ok:
-                            results.setdefault(file_name, {}).setdefault(page_num, {})[sub_kind] = normalized_payload
-                        else:
-                            invalid_entries.append(
-                                {
-                                    "file": file_name,
-                                    "page": page_num,
-                                    "kind": sub_kind,
-                                    "reason": reason,
-                                    "line": line_number,
-                                }
-                            )
-            elif kind in ("wind", "precipitation", "temperature"):
-                ok, normalized_payload, reason = _validate_series(kind, parsed)
-                if ok:
-                    results.setdefault(file_name, {}).setdefault(page_num, {})[kind] = normalized_payload
-                else:
-                    invalid_entries.append(
-                        {
-                            "file": file_name,
-                            "page": page_num,
-                            "kind": kind,
-                            "reason": reason,
-                            "line": line_number,
-                        }
-                    )
+    for line_number, obj in iter_jsonl(jsonl_path):
+        if obj.get("error"):
+            continue
+        # Match the custom_id inline before touching the response body, so unusable lines cost one regex
+        m = EXTRACT_ID_RE.match(obj.get("custom_id") or "")
+        if m is None:
+            continue
+        file_name, page_num, kind = m[1], int(m[2]), m[3]
+        if page_num <= 0:
+            continue
+        resp_wrapper = obj.get("response") or {}
+        body = resp_wrapper.get("body") or {}
+        parsed = extract_structured_output(body)
+        if not parsed:
+            continue
+        if kind == "combined":
+            for sub_kind in ("wind", "precipitation", "temperature"):
+                sub_payload = parsed.get(sub_kind)
+                if sub_payload:
+                    ok, normalized_payload, reason = _validate_series(sub_kind, sub_payload)
+                    if ok:
+                        results.setdefault(file_name, {}).setdefault(page_num, {})[sub_kind] = normalized_payload
+                    else:
+                        invalid_entries.append(
+                            {
+                                "file": file_name,
+                                "page": page_num,
+                                "kind": sub_kind,
+                                "reason": reason,
+                                "line": line_number,
+                            }
+                        )
+        elif kind in ("wind", "precipitation", "temperature"):
+            ok, normalized_payload, reason = _validate_series(kind, parsed)
+            if ok:
+                results.setdefault(file_name, {}).setdefault(page_num, {})[kind] = normalized_payload
+            else:
+                invalid_entries.append(
+                    {
+                        "file": file_name,
+                        "page": page_num,
+                        "kind": kind,
+                        "reason": reason,
+                        "line": line_number,
+                    }
+                )
     return results, invalid_entries
 
 
+def _load_run_results(
+    results_path: Path, detection_locations: Optional[Dict[Tuple[str, int], str]]
+) -> Tuple[Dict[str, Dict[int, Dict[str, Any]]], List[Dict[str, Any]], List[Dict]]:
+    structured, invalid_entries = load_structured_results(results_path)
+    rows = parse_jsonl_file(str(results_path), detection_locations=detection_locations)
+    return structured, invalid_entries, rows
+
+
+def _final_sort_key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    # Page-9 rows carry HourIndex "", which sorts after every numeric index (as pandas orders mixed columns)
+    hour_index = row["HourIndex"]
+    return (
+        row["SourceFile"],
+        row["Page"],
+        row["Section"],
+        (isinstance(hour_index, str), hour_index),
+        row["MeasurementType"],
+    )
+
+
+def _write_rows_csv(rows: List[Dict[str, Any]], path: Path) -> None:
+    """Write parsed rows straight to CSV (ROW_COLUMNS order) without a DataFrame round-trip."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(ROW_COLUMNS)
+        writer.writerows(map(_get_row_values, rows))
+
+
 def dataframe_to_row_map(df: pd.DataFrame) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
     row_map: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
     if df.empty:
         return row_map
-    for row in df.to_dict(orient="records"):
-        if isinstance(row.get("ValueNumeric"), float) and math.isnan(row.get("ValueNumeric")):
-            row["ValueNumeric"] = ""
-        if isinstance(row.get("ValueText"), float) and math.isnan(row.get("ValueText")):
-            row["ValueText"] = ""
-        if isinstance(row.get("Location"), float) and math.isnan(row.get("Location")):
-            row["Location"] = ""
-        row["Location"] = normalize_location_string(row.get("Location"))
-        key = (
-            row.get("SourceFile"),
-            int(row.get("Page")),
-            row.get("Section"),
-            row.get("Measurement"),
-            row.get("MeasurementType"),
-            int(row.get("HourIndex")),
-            row.get("HourLabel"),
-        )
-        row["ValueText"] = normalize_text_value(row.get("Section"), row.get("MeasurementType"), row.get("ValueText"))
-        row_map[key] = row
+    df = df.copy()
+    for col in ("ValueNumeric", "ValueText", "Location"):
+        if col in df.columns:
+            df[col] = df[col].where(df[col].notna(), "").astype(object)
+    # Locations and text values come from small vocabularies, so normalise each distinct value once
+    locations = {v: normalize_location_string(v) for v in df["Location"].unique()}
+    df["Location"] = df["Location"].map(locations)
+    text_triples = list(zip(df["Section"], df["MeasurementType"], df["ValueText"]))
+    texts = {t: normalize_text_value(*t) for t in set(text_triples)}
+    df["ValueText"] = [texts[t] for t in text_triples]
+    keys = zip(
+        df["SourceFile"],
+        df["Page"].astype(int).tolist(),
+        df["Section"],
+        df["Measurement"],
+        df["MeasurementType"],
+        df["HourIndex"].astype(int).tolist(),
+        df["HourLabel"],
+    )
+    row_map.update(zip(keys, df.to_dict(orient="records")))
     return row_map
 
 
+# Per kind, the series echoed back to the model when re-prompting after a disagreement
+_SUMMARY_FIELDS = {
+    "wind": ("wind_speed_mph", "wind_gust_mph", "wind_direction"),
+    "precipitation": ("rain_mm", "snow_cm", "precip_type"),
+    "temperature": ("air_temp_c", "freezing_level_m", "wet_bulb_freezing_level_m"),
+}
+
+
 def summarize_payload_for_prompt(kind: str, payload: Dict[str, Any]) -> str:
     hours = payload.get("hours") or []
     if not hours:
         return "(no data)"
-    if kind == "wind":
-        summary = {
-            "wind_speed_mph": [h.get("wind_speed_mph") for h in hours],
-            "wind_gust_mph": [h.get("wind_gust_mph") for h in hours],
-            "wind_direction": [h.get("wind_direction") for h in hours],
-        }
-    elif kind == "precipitation":
-        summary = {
-            "rain_mm": [h.get("rain_mm") for h in hours],
-            "snow_cm": [h.get("snow_cm") for h in hours],
-            "precip_type": [h.get("precip_type") for h in hours],
-        }
-    elif kind == "temperature":
-        summary = {
-            "air_temp_c": [h.get("air_temp_c") for h in hours],
-            "freezing_level_m": [h.get("freezing_level_m") for h in hours],
-            "wet_bulb_freezing_level_m": [h.get("wet_bulb_freezing_level_m") for h in hours],
-        }
-    else:
+    fields = _SUMMARY_FIELDS.get(kind)
+    if fields is None:
         summary = {"hours": hours}
-    return json.dumps(summary, separators=(",", ":"))
+    else:
+        # One list comprehension per field timed faster in CPython than a single zipped/itemgetter pass
+        summary = {field: [h.get(field) for h in hours] for field in fields}
+    return _dumps(summary).decode()
 
 
 def build_rerun_prompt(kind: str, payloads: List[Dict[str, Any]]) -> str:
@@ -530,10 +680,9 @@ def build_rerun_prompt(kind: str, payloads: List[Dict[str, Any]]) -> str:
     return prompt
 
 
-def submit_and_wait(client: OpenAI, jsonl_path: Path, out_results_path: Path, poll_interval: int = 20) -> Path:
-    jsonl_path = Path(jsonl_path)
-    out_results_path = Path(out_results_path)
-    with open(jsonl_path, "rb") as f:
+def submit_batch(client: OpenAI, jsonl_path: Path) -> str:
+    """Upload a batch JSONL and start the batch; returns the batch id."""
+    with open(Path(jsonl_path), "rb") as f:
         up = client.files.create(file=f, purpose="batch")
     batch = client.batches.create(
         input_file_id=up.id,
@@ -541,12 +690,30 @@ def submit_and_wait(client: OpenAI, jsonl_path: Path, out_results_path: Path, po
         completion_window="24h",
     )
     print(f"Submitted batch {batch.id}; status={batch.status}")
+    return batch.id
+
+
+def wait_for_batch(
+    client: OpenAI,
+    batch_id: str,
+    out_results_path: Path,
+    poll_interval: int = 20,
+    max_poll_interval: int = 300,
+) -> Path:
+    """Poll a submitted batch until it finishes and save its output JSONL to out_results_path.
+
+    Polls start every poll_interval seconds and back off by 1.5x per poll, up to max_poll_interval.
+    """
+    out_results_path = Path(out_results_path)
+    delay = float(min(poll_interval, max_poll_interval))
     while True:
-        b = client.batches.retrieve(batch.id)
-        print(f"status={b.status}")
+        b = client.batches.retrieve(batch_id)
+        print(f"{batch_id}: status={b.status}")
         if b.status in ("completed", "failed", "expired", "canceled"):
             break
-        time.sleep(poll_interval)
+        # Up to 10% jitter so concurrent waiters do not poll in lockstep
+        time.sleep(delay + random.uniform(0, delay * 0.1))
+        delay = min(delay * 1.5, max_poll_interval)
     if b.status != "completed":
         raise SystemExit(f"Batch {b.id} ended with status {b.status}")
     fid = b.output_file_id
@@ -567,6 +734,127 @@ def submit_and_wait(client: OpenAI, jsonl_path: Path, out_results_path: Path, po
     return out_results_path
 
 
+def submit_and_wait(
+    client: OpenAI,
+    jsonl_path: Path,
+    out_results_path: Path,
+    poll_interval: int = 20,
+    max_poll_interval: int = 300,
+) -> Path:
+    batch_id = submit_batch(client, jsonl_path)
+    return wait_for_batch(
+        client, batch_id, out_results_path, poll_interval=poll_interval, max_poll_interval=max_poll_interval
+    )
+
+
+def _tagged_path(path: Path, tag: str) -> Path:
+    return path.with_name(f"{path.stem}{tag}{path.suffix}") if tag else path
+
+
+def _concat_files(sources: Sequence[Path], dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with open(dest, "wb") as out:
+        for src in sources:
+            with open(src, "rb") as f:
+                shutil.copyfileobj(f, out)
+                end = f.tell()
+                # Keep JSONL line boundaries even if a file lacks a trailing newline
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        out.write(b"\n")
+
+
+def _shard_pdfs(pdfs: Sequence[Path], shard_count: int) -> List[List[Path]]:
+    """Split pdfs into shard_count groups of roughly equal total page count, keeping input order within each."""
+    page_counts = {pdf: pdf_page_count(str(pdf)) for pdf in pdfs}
+    loads = [0] * shard_count
+    assignment: Dict[Path, int] = {}
+    # Longest-first greedy: each PDF joins the currently lightest shard
+    for pdf in sorted(pdfs, key=page_counts.__getitem__, reverse=True):
+        shard_index = loads.index(min(loads))
+        assignment[pdf] = shard_index
+        loads[shard_index] += page_counts[pdf]
+    shards: List[List[Path]] = [[] for _ in range(shard_count)]
+    for pdf in pdfs:
+        shards[assignment[pdf]].append(pdf)
+    return shards
+
+
+def _detect_and_extract(
+    client: OpenAI,
+    model: str,
+    pdfs: Sequence[Path],
+    detect_jsonl: Path,
+    detect_results: Path,
+    extract_jsonl_paths: Sequence[Path],
+    extract_results_paths: Sequence[Path],
+    *,
+    pdf_lookup: Dict[str, Path],
+    dpi: int,
+    max_page_px: int,
+    max_crop_px: int,
+    kinds: Iterable[str],
+    poll_interval: int,
+    max_poll_interval: int,
+    render_workers: Optional[int],
+    render_cache_dir: Path,
+) -> Dict[str, Dict[int, Dict[str, Any]]]:
+    """Run detection for pdfs, then submit every extraction repeat built from it and wait for all of them."""
+    build_detection_jsonl(
+        model,
+        pdfs,
+        detect_jsonl,
+        dpi=dpi,
+        max_page_px=max_page_px,
+        workers=render_workers,
+        render_cache_dir=render_cache_dir,
+    )
+    submit_and_wait(
+        client,
+        detect_jsonl,
+        detect_results,
+        poll_interval=poll_interval,
+        max_poll_interval=max_poll_interval,
+    )
+    detection_map = parse_detection_pages([detect_results])
+
+    # Each repeat's upload runs in the background while the next repeat is built
+    with ThreadPoolExecutor(max_workers=len(extract_jsonl_paths)) as uploads:
+        submissions = []
+        for extract_jsonl_path, extract_results_path in zip(extract_jsonl_paths, extract_results_paths):
+            build_extraction_jsonl_from_detect(
+                model,
+                detection_map,
+                pdf_lookup,
+                extract_jsonl_path,
+                dpi=dpi,
+                max_crop_px=max_crop_px,
+                kinds=kinds,
+                workers=render_workers,
+                render_cache_dir=render_cache_dir,
+            )
+            submissions.append((uploads.submit(submit_batch, client, extract_jsonl_path), extract_results_path))
+        pending = [(fut.result(), results_path) for fut, results_path in submissions]
+
+    # Repeats only depend on detection_map, so all batches are in flight together and polled concurrently
+    with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+        waits = [
+            pool.submit(
+                wait_for_batch,
+                client,
+                batch_id,
+                results_path,
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+            )
+            for batch_id, results_path in pending
+        ]
+        for fut in waits:
+            fut.result()
+    return detection_map
+
+
 def run_pipeline(
     client: OpenAI,
     model: str,
@@ -581,22 +869,17 @@ def run_pipeline(
     default_numeric_tolerance: float = 1.0,
     tolerance_overrides: Optional[Dict[Tuple[str, str], float]] = None,
     rerun_on_disagreement: bool = True,
+    render_workers: Optional[int] = None,
+    max_poll_interval: int = 300,
+    shards: int = 1,
 ) -> Path:
     if pd is None:
         raise ImportError("pandas is required to run the batch pipeline. Please install pandas.")
     if OpenAI is None:
         raise ImportError("openai package is required to run the batch pipeline.")
     pdf_lookup = build_pdf_lookup(pdfs)
-    build_detection_jsonl(model, pdfs, paths.detect_jsonl, dpi=dpi, max_page_px=max_page_px)
-    submit_and_wait(client, paths.detect_jsonl, paths.detect_results, poll_interval=poll_interval)
-
-    detection_map = parse_detection_pages([paths.detect_results])
-    detection_locations = {
-        (file_name, page_num): page_data.get("location") or ""
-        for file_name, pages in detection_map.items()
-        for page_num, page_data in pages.items()
-        if page_data.get("location")
-    } or None
+    # Detection, every extraction repeat and the rerun pass all crop the same pages; render them once
+    render_cache_dir = paths.out_csv.parent / ".render_cache"
 
     repeat_total = max(1, extraction_repeats)
     run_maps: List[Dict[Tuple[Any, ...], Dict[str, Any]]] = []
@@ -605,35 +888,80 @@ def run_pipeline(
 
     base_extract_jsonl = paths.extract_jsonl
     base_extract_results = paths.extract_results
-
-    for run_index in range(repeat_total):
-        suffix = "" if run_index == 0 else f"_r{run_index + 1}"
-        extract_jsonl_path = (
-            base_extract_jsonl
-            if run_index == 0
-            else base_extract_jsonl.with_name(f"{base_extract_jsonl.stem}{suffix}{base_extract_jsonl.suffix}")
-        )
-        extract_results_path = (
-            base_extract_results
-            if run_index == 0
-            else base_extract_results.with_name(f"{base_extract_results.stem}{suffix}{base_extract_results.suffix}")
+    repeat_tags = ["" if run_index == 0 else f"_r{run_index + 1}" for run_index in range(repeat_total)]
+    extract_results_paths = [_tagged_path(base_extract_results, tag) for tag in repeat_tags]
+
+    shard_count = max(1, min(shards, len(pdfs)))
+    # Shards build concurrently, so they split the render process budget instead of each taking every CPU
+    stage_workers = render_workers
+    if shard_count > 1:
+        stage_workers = max(1, (render_workers or os.cpu_count() or 1) // shard_count)
+    stage = partial(
+        _detect_and_extract,
+        client,
+        model,
+        pdf_lookup=pdf_lookup,
+        dpi=dpi,
+        max_page_px=max_page_px,
+        max_crop_px=max_crop_px,
+        kinds=kinds,
+        poll_interval=poll_interval,
+        max_poll_interval=max_poll_interval,
+        render_workers=stage_workers,
+        render_cache_dir=render_cache_dir,
+    )
+    if shard_count == 1:
+        detection_map = stage(
+            pdfs,
+            paths.detect_jsonl,
+            paths.detect_results,
+            [_tagged_path(base_extract_jsonl, tag) for tag in repeat_tags],
+            extract_results_paths,
         )
+    else:
+        # Each shard runs its own detect -> extract chain, so a slow detection batch only holds up its own PDFs
+        shard_specs = []
+        for shard_index, shard_pdfs in enumerate(_shard_pdfs(pdfs, shard_count)):
+            shard_tag = f".shard{shard_index + 1}"
+            shard_specs.append(
+                (
+                    shard_pdfs,
+                    _tagged_path(paths.detect_jsonl, shard_tag),
+                    _tagged_path(paths.detect_results, shard_tag),
+                    [_tagged_path(base_extract_jsonl, tag + shard_tag) for tag in repeat_tags],
+                    [_tagged_path(results_path, shard_tag) for results_path in extract_results_paths],
+                )
+            )
+        with ThreadPoolExecutor(max_workers=shard_count) as pool:
+            shard_maps = list(pool.map(lambda spec: stage(*spec), shard_specs))
+        # Shards cover disjoint PDFs, so their results merge by concatenation
+        detection_map = {}
+        for shard_map in shard_maps:
+            detection_map.update(shard_map)
+        _concat_files([spec[2] for spec in shard_specs], paths.detect_results)
+        for run_index, results_path in enumerate(extract_results_paths):
+            _concat_files([spec[4][run_index] for spec in shard_specs], results_path)
 
-        build_extraction_jsonl_from_detect(
-            model,
-            detection_map,
-            pdf_lookup,
-            extract_jsonl_path,
-            dpi=dpi,
-            max_crop_px=max_crop_px,
-            kinds=kinds,
-        )
-        submit_and_wait(client, extract_jsonl_path, extract_results_path, poll_interval=poll_interval)
+    detection_locations = {
+        (file_name, page_num): page_data.get("location") or ""
+        for file_name, pages in detection_map.items()
+        for page_num, page_data in pages.items()
+        if page_data.get("location")
+    } or None
+
+    # Each run's results file is parsed independently, so parse them side by side once all batches are back
+    load_one = partial(_load_run_results, detection_locations=detection_locations)
+    n_workers = _pool_workers(None, len(extract_results_paths))
+    if n_workers == 1:
+        loaded_runs = [load_one(path) for path in extract_results_paths]
+    else:
+        with _spawn_pool(n_workers) as pool:
+            loaded_runs = list(pool.map(load_one, extract_results_paths))
 
-        structured, invalid_entries = load_structured_results(extract_results_path)
+    for run_index, (structured, invalid_entries, rows) in enumerate(loaded_runs):
         structured_runs.append(structured)
         if invalid_entries:
-            reason_counts = Counter(entry["reason"] for entry in invalid_entries)
+            reason_counts = Counter(map(_get_reason, invalid_entries))
             invalid_summaries.append(
                 {
                     "run": run_index + 1,
@@ -644,19 +972,18 @@ def run_pipeline(
         else:
             invalid_summaries.append({"run": run_index + 1, "total_invalid": 0, "reasons": {}})
 
-        rows = parse_jsonl_file(str(extract_results_path), detection_locations=detection_locations)
-        df = pd.DataFrame(rows)
-        run_maps.append(dataframe_to_row_map(df))
+        run_maps.append(dataframe_to_row_map(pd.DataFrame(rows)))
 
         per_run_csv = paths.out_csv.with_name(f"{paths.out_csv.stem}_run{run_index + 1}.csv")
-        per_run_csv.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(per_run_csv, index=False)
+        _write_rows_csv(rows, per_run_csv)
 
     tolerance_map = dict(DEFAULT_NUMERIC_TOLERANCES)
     if tolerance_overrides:
         tolerance_map.update(tolerance_overrides)
 
     final_rows_map, disagreements = aggregate_runs(run_maps, tolerance_map, default_numeric_tolerance)
+    # A single repeat has nothing to compare against, so the rerun and the disagreement report are skipped
+    compare_runs = repeat_total > 1
 
     report: Dict[str, Any] = {
         "run_count": repeat_total,
@@ -664,10 +991,10 @@ def run_pipeline(
     }
 
     flagged_graphs = {
-        (entry["graph"]["SourceFile"], entry["graph"]["Page"], entry["graph"]["Section"])
-        for entry in disagreements
+        (graph["SourceFile"], graph["Page"], graph["Section"])
+        for graph in map(_get_graph, disagreements)
+        if graph["Section"] in SECTION_KIND_MAP
     }
-    flagged_graphs = {g for g in flagged_graphs if SECTION_KIND_MAP.get(g[2])}
     if flagged_graphs:
         report["flagged_graphs"] = [
             {"SourceFile": src, "Page": page, "Section": section, "kind": SECTION_KIND_MAP.get(section)}
@@ -677,7 +1004,7 @@ def run_pipeline(
         report["invalid_runs"] = invalid_summaries
 
     rerun_info: Dict[str, Any] = {}
-    if flagged_graphs and rerun_on_disagreement:
+    if compare_runs and flagged_graphs and rerun_on_disagreement:
         kinds_subset = sorted({SECTION_KIND_MAP[g[2]] for g in flagged_graphs if SECTION_KIND_MAP.get(g[2])})
         if kinds_subset:
             only_graphs: List[Tuple[str, int, str]] = []
@@ -712,13 +1039,21 @@ def run_pipeline(
                     only_graphs=only_graphs,
                     prompt_overrides=prompt_overrides,
                     prefer_combined=False,
+                    workers=render_workers,
+                    render_cache_dir=render_cache_dir,
+                )
+                submit_and_wait(
+                    client,
+                    rerun_jsonl,
+                    rerun_results,
+                    poll_interval=poll_interval,
+                    max_poll_interval=max_poll_interval,
                 )
-                submit_and_wait(client, rerun_jsonl, rerun_results, poll_interval=poll_interval)
 
                 structured_rerun, rerun_invalid = load_structured_results(rerun_results)
                 structured_runs.append(structured_rerun)
                 if rerun_invalid:
-                    reason_counts = Counter(entry["reason"] for entry in rerun_invalid)
+                    reason_counts = Counter(map(_get_reason, rerun_invalid))
                     invalid_summaries.append(
                         {
                             "run": f"rerun",
@@ -728,15 +1063,13 @@ def run_pipeline(
                     )
 
                 rerun_rows = parse_jsonl_file(str(rerun_results), detection_locations=detection_locations)
-                rerun_df = pd.DataFrame(rerun_rows)
-                rerun_map = dataframe_to_row_map(rerun_df)
+                rerun_map = dataframe_to_row_map(pd.DataFrame(rerun_rows))
                 for key, row in rerun_map.items():
                     final_rows_map[key] = row
                 harmonize_locations(final_rows_map)
 
                 rerun_csv = paths.out_csv.with_name(f"{paths.out_csv.stem}{rerun_suffix}.csv")
-                rerun_csv.parent.mkdir(parents=True, exist_ok=True)
-                rerun_df.to_csv(rerun_csv, index=False)
+                _write_rows_csv(rerun_rows, rerun_csv)
 
                 rerun_info = {
                     "graphs": [
@@ -766,20 +1099,14 @@ def run_pipeline(
             extra_rows = []
         final_rows.extend(extra_rows)
 
-    final_df = pd.DataFrame(final_rows)
-    if not final_df.empty:
-        final_df = final_df.sort_values(
-            ["SourceFile", "Page", "Section", "HourIndex", "MeasurementType"]
-        ).reset_index(drop=True)
-
-    paths.out_csv.parent.mkdir(parents=True, exist_ok=True)
-    final_df.to_csv(paths.out_csv, index=False)
-    print(f"Wrote {len(final_df)} rows to {paths.out_csv}")
+    # Sorting the row dicts in place puts them in output order before they are streamed to the CSV
+    final_rows.sort(key=_final_sort_key)
+    _write_rows_csv(final_rows, paths.out_csv)
+    print(f"Wrote {len(final_rows)} rows to {paths.out_csv}")
 
-    if paths.disagreement_report:
+    if compare_runs and paths.disagreement_report:
         paths.disagreement_report.parent.mkdir(parents=True, exist_ok=True)
-        with open(paths.disagreement_report, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2)
+        paths.disagreement_report.write_bytes(dumps_indented(report))
         print(f"Saved disagreement report to {paths.disagreement_report}")
 
     return paths.out_csv
@@ -794,7 +1121,13 @@ def main():
     parser.add_argument("--dpi", type=int, default=150, help="PDF render DPI")
     parser.add_argument("--max_page_px", type=int, default=900, help="Max page side for detection requests")
     parser.add_argument("--max_crop_px", type=int, default=720, help="Max crop side for extraction requests")
-    parser.add_argument("--poll_interval", type=int, default=20, help="Seconds between batch status polls")
+    parser.add_argument("--poll_interval", type=int, default=20, help="Seconds before the first batch status re-poll")
+    parser.add_argument(
+        "--max_poll_interval",
+        type=int,
+        default=300,
+        help="Cap in seconds for the backed-off batch status poll interval (default: 300)",
+    )
     parser.add_argument("--out_csv", default=None, help="Override output CSV path (default: <output-dir>/batch_results.csv)")
     parser.add_argument("--detect_jsonl", default=None, help="Override detection JSONL path")
     parser.add_argument("--detect_results", default=None, help="Override detection results JSONL path")
@@ -812,7 +1145,7 @@ def main():
     parser.add_argument(
         "--disagreement_report",
         default=None,
-        help="Path to write disagreement report JSON (default: <output-dir>/disagreement_report.json)",
+        help="Path to write disagreement report JSON (default: <output-dir>/disagreement_report.json; not written with --extract_repeats 1)",
     )
     parser.add_argument(
         "--no_disagreement_report",
@@ -824,6 +1157,18 @@ def main():
         default=",".join(DEFAULT_KINDS),
         help="Comma-separated list of graph kinds to extract (default: wind,precipitation,temperature)",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the PDFs into this many page-balanced detect -> extract batch chains that run concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--render_workers",
+        type=int,
+        default=None,
+        help="Processes used to render PDFs when building batch requests (default: min(CPU count, number of PDFs))",
+    )
     args = parser.parse_args()
 
     input_dir = Path(args.input_dir).resolve()
@@ -888,6 +1233,9 @@ def main():
         default_numeric_tolerance=args.default_numeric_tolerance,
         tolerance_overrides=tolerance_overrides or None,
         rerun_on_disagreement=not args.disable_rerun,
+        render_workers=args.render_workers,
+        max_poll_interval=args.max_poll_interval,
+        shards=args.shards,
     )
 
 
@@ -1,6 +1,9 @@
+from functools import lru_cache
 from typing import Dict, Any
 
 
+# Each schema is built once and the same dict is returned on every call; treat it as read-only
+@lru_cache(maxsize=None)
 def region_detection_schema() -> Dict[str, Any]:
     return {
         "name": "graph_regions_schema",
@@ -39,6 +42,7 @@ def region_detection_schema() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=None)
 def wind_schema() -> Dict[str, Any]:
     return {
         "name": "wind_series_schema",
@@ -78,6 +82,7 @@ def wind_schema() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=None)
 def precip_schema() -> Dict[str, Any]:
     return {
         "name": "precip_series_schema",
@@ -110,6 +115,7 @@ def precip_schema() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=None)
 def temperature_schema() -> Dict[str, Any]:
     return {
         "name": "temp_series_schema",
@@ -1,4 +1,6 @@
 from pathlib import Path
+
+import pytest
 from PIL import Image
 
 from src.batch_builder import (
@@ -10,10 +12,14 @@ from src.batch_builder import (
 )
 
 
-def test_build_detect_regions_request_shape():
-    # Small dummy image for faster test
-    img = Image.new('RGB', (200, 200), (255, 255, 255))
-    req = build_detect_regions_request('gpt-5', img)
+@pytest.fixture(scope="session")
+def small_rgb():
+    # Builders only read their images, so one small dummy crop serves every shape test
+    return Image.new('RGB', (300, 200), (240, 240, 240))
+
+
+def test_build_detect_regions_request_shape(small_rgb):
+    req = build_detect_regions_request('gpt-5', small_rgb)
     assert req['method'] == 'POST'
     assert req['url'] == '/v1/responses'
     body = req['body']
@@ -26,13 +32,8 @@ def test_build_detect_regions_request_shape():
     assert content[1]['type'] == 'input_image'
 
 
-def test_build_extract_all_request_shape():
-    # Create three dummy crops
-    crops = {
-        'wind': Image.new('RGB', (300, 200), (240, 240, 240)),
-        'precipitation': Image.new('RGB', (300, 200), (240, 240, 240)),
-        'temperature': Image.new('RGB', (300, 200), (240, 240, 240)),
-    }
+def test_build_extract_all_request_shape(small_rgb):
+    crops = {'wind': small_rgb, 'precipitation': small_rgb, 'temperature': small_rgb}
     req = build_extract_all_request('gpt-5', crops)
     assert req['method'] == 'POST'
     body = req['body']
@@ -47,11 +48,10 @@ def test_build_extract_all_request_shape():
     assert content[3]['type'] == 'input_image'
 
 
-def test_build_extract_individual_requests_shape():
-    crop = Image.new('RGB', (320, 220), (250, 250, 250))
-    r1 = build_extract_wind_request('gpt-5', crop)
+def test_build_extract_individual_requests_shape(small_rgb):
+    r1 = build_extract_wind_request('gpt-5', small_rgb)
     assert r1['url'] == '/v1/responses' and r1['body']['text']['format']['name'] == 'wind_series_schema'
-    r2 = build_extract_precip_request('gpt-5', crop)
+    r2 = build_extract_precip_request('gpt-5', small_rgb)
     assert r2['body']['text']['format']['name'] == 'precip_series_schema'
-    r3 = build_extract_temperature_request('gpt-5', crop)
+    r3 = build_extract_temperature_request('gpt-5', small_rgb)
     assert r3['body']['text']['format']['name'] == 'temp_series_schema'
@@ -0,0 +1,37 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.jsonio
+
+PAYLOAD = {
+    "location": "Càrn Dearg – Ben Nevis",
+    "hours": [{"hour": "18:00", "wind_speed_mph": 25, "temp_c": -3.5, "note": None, "gust": True}],
+    "runs": {1: {"total_invalid": 0, "reasons": {}}, 2: []},
+}
+
+
+def _load_jsonio(monkeypatch, *blocked):
+    """A fresh copy of src/jsonio.py imported as if the given optional backends were not installed."""
+    for name in blocked:
+        monkeypatch.setitem(sys.modules, name, None)
+    spec = importlib.util.spec_from_file_location("_jsonio_copy", Path(src.jsonio.__file__))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_orjson_backend_matches_stdlib(monkeypatch):
+    pytest.importorskip("orjson")
+    fast = _load_jsonio(monkeypatch, "simdjson")
+    monkeypatch.undo()
+    slow = _load_jsonio(monkeypatch, "simdjson", "orjson")
+    assert fast.BACKEND == "orjson"
+    assert slow.BACKEND == "json"
+
+    assert fast.dumps(PAYLOAD) == slow.dumps(PAYLOAD)
+    assert fast.dumps_indented(PAYLOAD) == slow.dumps_indented(PAYLOAD)
+    encoded = slow.dumps(PAYLOAD)
+    assert fast.loads(encoded) == slow.loads(encoded) == fast.line_loader()(encoded)
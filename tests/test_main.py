@@ -0,0 +1,75 @@
+import base64
+import io
+
+import fitz
+from PIL import Image
+
+from src.extractors import ROW_COLUMNS
+from src.main import process_pdf
+
+
+class _OtherPageClient:
+    def detect_regions(self, data_url, feedback=None):
+        return {"page_type": "other", "graphs": []}
+
+
+def test_process_pdf_skips_non_area_pages(tmp_path):
+    pdf_path = tmp_path / "forecast.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    doc.save(str(pdf_path))
+    doc.close()
+    csv_path = tmp_path / "rows.csv"
+    seen = []
+    df = process_pdf(
+        str(pdf_path),
+        str(tmp_path / "out"),
+        "gpt-5",
+        dpi=50,
+        only_pages=[2],
+        detect_method="llm",
+        use_cache=False,
+        client=_OtherPageClient(),
+        csv_path=str(csv_path),
+        on_rows=lambda page, columns: seen.append(page),
+    )
+    assert df.empty
+    assert seen == []
+    assert csv_path.read_text(encoding="utf-8") == ",".join(ROW_COLUMNS) + "\n"
+
+
+class _WindPageClient:
+    def __init__(self):
+        self.crop_sizes = []
+
+    def detect_regions(self, data_url, feedback=None):
+        return {"page_type": "area_graphs", "location": "Ben Nevis", "graphs": [{"kind": "wind", "bbox": [0, 0, 1, 1]}]}
+
+    def extract_wind(self, data_url, feedback=None):
+        raw = base64.b64decode(data_url.split(",", 1)[1])
+        self.crop_sizes.append(Image.open(io.BytesIO(raw)).size)
+        return {}
+
+
+def test_process_pdf_crops_to_max_crop_px(tmp_path):
+    pdf_path = tmp_path / "forecast.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    doc.save(str(pdf_path))
+    doc.close()
+    client = _WindPageClient()
+    process_pdf(
+        str(pdf_path),
+        str(tmp_path / "out"),
+        "gpt-5",
+        dpi=200,
+        only_pages=[2],
+        detect_method="llm",
+        use_cache=False,
+        client=client,
+        kinds_filter=["wind"],
+        max_crop_px=1600,
+    )
+    assert client.crop_sizes and max(client.crop_sizes[0]) == 1600